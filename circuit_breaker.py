@@ -24,6 +24,9 @@ class CircuitBreakerConfig:
     success_threshold: int = 3
     timeout: int = 30
     expected_exception: type = Exception
+    # Each consecutive re-open multiplies recovery_timeout by this, up to max_recovery_timeout
+    backoff_factor: float = 1.0
+    max_recovery_timeout: int = 600
 
 
 class CircuitBreaker:
@@ -43,6 +46,7 @@ class CircuitBreaker:
         self.success_count = 0
         self.last_failure_time = None
         self.last_success_time = None
+        self.open_count = 0  # Consecutive trips without closing in between
         self.lock = threading.Lock()
         
         logger.info(f"Circuit breaker '{name}' initialized with config: {self.config}")
@@ -92,6 +96,11 @@ class CircuitBreaker:
         """Execute function with timeout."""
         import signal
         
+        # SIGALRM can only be installed from the main thread (not e.g. Flask
+        # request threads); elsewhere the call runs without a timeout
+        if threading.current_thread() is not threading.main_thread():
+            return func(*args, **kwargs)
+        
         def timeout_handler(signum, frame):
             raise TimeoutError(f"Function call timed out after {self.config.timeout} seconds")
         
@@ -112,7 +121,12 @@ class CircuitBreaker:
             return True
         
         time_since_failure = time.time() - self.last_failure_time
-        return time_since_failure >= self.config.recovery_timeout
+        return time_since_failure >= self._recovery_timeout()
+
+    def _recovery_timeout(self) -> float:
+        """Seconds to stay OPEN, backed off by how many times in a row the circuit tripped."""
+        backoff = self.config.backoff_factor ** max(self.open_count - 1, 0)
+        return min(self.config.recovery_timeout * backoff, self.config.max_recovery_timeout)
 
     def _on_success(self) -> None:
         """Handle successful function call."""
@@ -124,6 +138,7 @@ class CircuitBreaker:
                 if self.success_count >= self.config.success_threshold:
                     self.state = CircuitState.CLOSED
                     self.failure_count = 0
+                    self.open_count = 0
                     logger.info(f"Circuit breaker '{self.name}' moved to CLOSED state")
             elif self.state == CircuitState.CLOSED:
                 # Reset failure count on success
@@ -138,9 +153,11 @@ class CircuitBreaker:
             if self.state == CircuitState.HALF_OPEN:
                 # Any failure in half-open state opens the circuit
                 self.state = CircuitState.OPEN
+                self.open_count += 1
                 logger.warning(f"Circuit breaker '{self.name}' moved to OPEN state (failure in half-open)")
             elif self.state == CircuitState.CLOSED and self.failure_count >= self.config.failure_threshold:
                 self.state = CircuitState.OPEN
+                self.open_count += 1
                 logger.warning(f"Circuit breaker '{self.name}' moved to OPEN state (failure threshold reached)")
 
     def get_state(self) -> Dict[str, Any]:
@@ -171,6 +188,7 @@ class CircuitBreaker:
             self.state = CircuitState.CLOSED
             self.failure_count = 0
             self.success_count = 0
+            self.open_count = 0
             self.last_failure_time = None
             self.last_success_time = None
             logger.info(f"Circuit breaker '{self.name}' manually reset")
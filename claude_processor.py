@@ -1,6 +1,7 @@
 import json
 import logging
 import re
+from dataclasses import asdict
 from typing import Dict, List, Optional
 import threading
 
@@ -181,7 +182,7 @@ class ClaudeProcessor:
             return Article(headline="", summary="", body="", key_insights=[], error="Shutdown requested")
 
         title_theme = re.sub(r"[^\w\s]", "", title_theme)
-        analyses_json = json.dumps([vars(a) for a in analyses if not a.error], indent=2)
+        analyses_json = json.dumps([asdict(a) for a in analyses if not a.error], indent=2)
         prompt = self.prompts["article"].format(title_theme=title_theme, analyses_json=analyses_json)
 
         try:
@@ -2,6 +2,7 @@ import json
 import logging
 import os
 import threading
+from dataclasses import asdict
 from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -100,7 +101,7 @@ class ContentManager:
         with open(html_filename, "w", encoding="utf-8") as f:
             f.write(self._format_for_substack_file(article))
         with open(json_filename, "w", encoding="utf-8") as f:
-            json.dump(vars(article), f, indent=2, ensure_ascii=False)
+            json.dump(asdict(article), f, indent=2, ensure_ascii=False)
         logger.info(f"Draft saved: HTML={html_filename}, JSON={json_filename}")
 
         if self.substack_config.get("email_drafts"):
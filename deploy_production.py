@@ -37,7 +37,7 @@ class ProductionDeployer:
         is_valid, errors = validator.validate_environment()
         
         if not is_valid:
-            self.errors.extend(errors)
+            self.errors.extend(map(str, errors))
             logger.error("❌ Environment validation failed")
             return False
         
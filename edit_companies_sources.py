@@ -6,25 +6,99 @@ This script helps you easily add, edit, or remove companies and sources
 from the RetailXAI configuration files.
 """
 
+import contextlib
+import hashlib
+import mmap
+import orjson
+import struct
 import yaml
 import json
 import os
 import sys
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Formatting for the human-edited YAML output
+YAML_DUMP_OPTIONS = {"default_flow_style": False, "indent": 2}
+
+# Parsed YAML files are cached as JSON sidecars in the user's cache directory,
+# never next to the shared config files. A sidecar's 32-byte header records
+# the source file's mtime_ns and size; a mismatch means it is stale.
+SIDECAR_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                           "retailxai", "config")
+SIDECAR_HEADER = struct.Struct("<qq16x")
+
+def _sidecar_path(path: str) -> str:
+    """Sidecar file caching the parse of `path`."""
+    key = hashlib.blake2b(os.path.realpath(path).encode(), digest_size=16).hexdigest()
+    return os.path.join(SIDECAR_DIR, key + ".json")
+
+def _read_sidecar(path: str) -> Optional[Any]:
+    """Return the cached parse of `path` if its sidecar is current, else None."""
+    try:
+        st = os.stat(path)
+        with open(_sidecar_path(path), "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if SIDECAR_HEADER.unpack_from(mm) != (st.st_mtime_ns, st.st_size):
+                return None
+            return orjson.loads(mm[SIDECAR_HEADER.size:])
+    except (OSError, ValueError, struct.error):
+        return None
+
+def _write_sidecar(path: str, data: Any) -> None:
+    """Atomically (re)write the sidecar for `path`; failures only cost the cache.
+
+    Data JSON cannot round-trip exactly (dates, non-string keys) is not cached.
+    """
+    sidecar = _sidecar_path(path)
+    tmp_path = f"{sidecar}.tmp.{os.getpid()}"
+    try:
+        payload = orjson.dumps(data)
+        if orjson.loads(payload) != data:
+            return
+        st = os.stat(path)
+        os.makedirs(SIDECAR_DIR, mode=0o700, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(SIDECAR_HEADER.pack(st.st_mtime_ns, st.st_size))
+            f.write(payload)
+        os.replace(tmp_path, sidecar)
+    except (OSError, TypeError):
+        pass
 
 class RetailXAIConfigEditor:
-    def __init__(self, config_dir: str = "/home/retailxai/precipice/config"):
+    def __init__(self, config_dir: str = "/home/retailxai/precipice/config",
+                 pretty_yaml: bool = False):
         self.config_dir = config_dir
+        # companies.yaml is written as JSON (valid YAML) unless asked otherwise
+        self.pretty_yaml = pretty_yaml
         self.companies_file = os.path.join(config_dir, "companies.yaml")
         self.sources_file = os.path.join(config_dir, "sources.json")
         self.config_file = os.path.join(config_dir, "config.yaml")
+        # Parsed data for files currently open in an edit_* block, keyed by
+        # file kind, so nested edits share a single load/save.
+        self._editing: Dict[str, Any] = {}
+        self._dirty: set = set()
+        self._saved: Dict[str, bool] = {}
+        # Success messages from nested edits, printed once the outermost
+        # block for that file has saved it.
+        self._pending: Dict[str, List[str]] = {}
+        # Lookup indexes over the data being edited, built once per edit block.
+        self._indexes: Dict[str, Any] = {}
         
     def load_companies(self) -> Dict[str, Any]:
         """Load companies configuration from YAML file."""
+        cached = _read_sidecar(self.companies_file)
+        if cached is not None:
+            return cached
         try:
-            with open(self.companies_file, 'r') as f:
-                return yaml.safe_load(f)
+            # One binary read; the loader decodes UTF-8 itself
+            with open(self.companies_file, 'rb') as f:
+                data = yaml.load(f.read(), Loader=YAML_LOADER)
+            _write_sidecar(self.companies_file, data)
+            return data
         except FileNotFoundError:
             print(f"Error: {self.companies_file} not found")
             return {}
@@ -33,10 +107,19 @@ class RetailXAIConfigEditor:
             return {}
     
     def save_companies(self, data: Dict[str, Any]) -> bool:
-        """Save companies configuration to YAML file."""
+        """Save companies configuration to YAML file.
+        
+        Written as indented JSON, which YAML loaders read unchanged, unless
+        pretty_yaml is set.
+        """
         try:
-            with open(self.companies_file, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False, indent=2)
+            if self.pretty_yaml:
+                with open(self.companies_file, 'w') as f:
+                    yaml.dump(data, f, **YAML_DUMP_OPTIONS)
+            else:
+                with open(self.companies_file, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            _write_sidecar(self.companies_file, data)
             return True
         except Exception as e:
             print(f"Error saving {self.companies_file}: {e}")
@@ -66,9 +149,15 @@ class RetailXAIConfigEditor:
     
     def load_config(self) -> Dict[str, Any]:
         """Load main configuration from YAML file."""
+        cached = _read_sidecar(self.config_file)
+        if cached is not None:
+            return cached
         try:
-            with open(self.config_file, 'r') as f:
-                return yaml.safe_load(f)
+            # One binary read; the loader decodes UTF-8 itself
+            with open(self.config_file, 'rb') as f:
+                data = yaml.load(f.read(), Loader=YAML_LOADER)
+            _write_sidecar(self.config_file, data)
+            return data
         except FileNotFoundError:
             print(f"Error: {self.config_file} not found")
             return {}
@@ -80,24 +169,84 @@ class RetailXAIConfigEditor:
         """Save main configuration to YAML file."""
         try:
             with open(self.config_file, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False, indent=2)
+                yaml.dump(data, f, **YAML_DUMP_OPTIONS)
+            _write_sidecar(self.config_file, data)
             return True
         except Exception as e:
             print(f"Error saving {self.config_file}: {e}")
             return False
     
-    def add_company(self, name: str, youtube_channels: List[str] = None, 
-                   rss_feed: str = None, keywords: List[str] = None) -> bool:
-        """Add a new company to the configuration."""
-        companies_data = self.load_companies()
-        if not companies_data:
-            companies_data = {"companies": []}
+    @contextlib.contextmanager
+    def _edit(self, kind: str, load: Callable[[], Any], save: Callable[[Any], bool],
+              default: Callable[[], Any]) -> Iterator[Any]:
+        """Load a config file once, yield it, and save on exit only if it was mutated."""
+        if kind in self._editing:
+            yield self._editing[kind]
+            return
+        
+        data = load() or default()
+        self._editing[kind] = data
+        self._dirty.discard(kind)
+        self._saved[kind] = True
+        try:
+            yield data
+        finally:
+            del self._editing[kind]
+            self._indexes.pop(kind, None)
+            pending = self._pending.pop(kind, [])
+        self._saved[kind] = save(data) if kind in self._dirty else True
+        self._dirty.discard(kind)
+        if self._saved[kind]:
+            for message in pending:
+                print(message)
+    
+    def _report(self, kind: str, message: str) -> bool:
+        """Print a success message once the `kind` file is on disk.
+        
+        Inside an outer edit block the message is held until that block
+        saves, and the change counts as staged (True); otherwise returns
+        whether the save that just ran succeeded.
+        """
+        if kind in self._editing:
+            self._pending.setdefault(kind, []).append(message)
+            return True
+        if not self._saved.get(kind):
+            return False
+        print(message)
+        return True
+    
+    def edit_companies(self):
+        """Context manager for batched edits to the companies configuration."""
+        return self._edit("companies", self.load_companies, self.save_companies,
+                          lambda: {"companies": []})
+    
+    def edit_sources(self):
+        """Context manager for batched edits to the sources configuration."""
+        return self._edit("sources", self.load_sources, self.save_sources, list)
+    
+    def edit_config(self):
+        """Context manager for batched edits to the main configuration."""
+        return self._edit("config", self.load_config, self.save_config, dict)
+    
+    def _index(self, kind: str, build: Callable[[], Any]) -> Any:
+        """Return the lookup index for the data being edited, building it on first use."""
+        if kind not in self._indexes:
+            self._indexes[kind] = build()
+        return self._indexes[kind]
+    
+    def _insert_company(self, companies_data: Dict[str, Any], name: str,
+                        youtube_channels: List[str] = None, rss_feed: str = None,
+                        keywords: List[str] = None) -> bool:
+        """Append a company to already-loaded data, skipping duplicates."""
+        companies = companies_data.setdefault("companies", [])
+        name_index = self._index("companies", lambda: {
+            c.get("name", "").lower(): i for i, c in enumerate(companies)
+        })
         
         # Check if company already exists
-        for company in companies_data.get("companies", []):
-            if company.get("name", "").lower() == name.lower():
-                print(f"Company '{name}' already exists")
-                return False
+        if name.lower() in name_index:
+            print(f"Company '{name}' already exists")
+            return False
         
         new_company = {
             "name": name,
@@ -106,59 +255,77 @@ class RetailXAIConfigEditor:
             "keywords": keywords or []
         }
         
-        companies_data.setdefault("companies", []).append(new_company)
+        name_index[name.lower()] = len(companies)
+        companies.append(new_company)
+        self._dirty.add("companies")
+        return True
+    
+    def add_company(self, name: str, youtube_channels: List[str] = None, 
+                   rss_feed: str = None, keywords: List[str] = None) -> bool:
+        """Add a new company to the configuration."""
+        with self.edit_companies() as companies_data:
+            added = self._insert_company(companies_data, name, youtube_channels,
+                                         rss_feed, keywords)
+        
+        if not added:
+            return False
+        return self._report("companies", f"Successfully added company: {name}")
+    
+    def add_companies(self, names: Iterable[str]) -> List[str]:
+        """Add several companies with a single load and save of the configuration."""
+        with self.edit_companies() as companies_data:
+            added = [name for name in names
+                     if self._insert_company(companies_data, name)]
         
-        if self.save_companies(companies_data):
-            print(f"Successfully added company: {name}")
-            return True
-        return False
+        return [name for name in added
+                if self._report("companies", f"Successfully added company: {name}")]
     
     def add_source(self, source_id: str, entity_id: str, source_type: str, 
                   details: Dict[str, Any]) -> bool:
         """Add a new source to the configuration."""
-        sources_data = self.load_sources()
-        
-        # Check if source already exists
-        for source in sources_data:
-            if source.get("source_id") == source_id:
+        with self.edit_sources() as sources_data:
+            source_id_index = self._index("sources", lambda: {
+                s.get("source_id"): i for i, s in enumerate(sources_data)
+            })
+            
+            # Check if source already exists
+            if source_id in source_id_index:
                 print(f"Source '{source_id}' already exists")
                 return False
+            
+            new_source = {
+                "source_id": source_id,
+                "entity_id": entity_id,
+                "source_type": source_type,
+                "details": details
+            }
+            
+            source_id_index[source_id] = len(sources_data)
+            sources_data.append(new_source)
+            self._dirty.add("sources")
         
-        new_source = {
-            "source_id": source_id,
-            "entity_id": entity_id,
-            "source_type": source_type,
-            "details": details
-        }
-        
-        sources_data.append(new_source)
-        
-        if self.save_sources(sources_data):
-            print(f"Successfully added source: {source_id}")
-            return True
-        return False
+        return self._report("sources", f"Successfully added source: {source_id}")
     
     def add_stock_symbol(self, symbol: str) -> bool:
         """Add a stock symbol to the Yahoo Finance configuration."""
-        config_data = self.load_config()
-        
-        if "sources" not in config_data:
-            config_data["sources"] = {}
-        if "yahoo_finance" not in config_data["sources"]:
-            config_data["sources"]["yahoo_finance"] = {"enabled": True, "symbols": []}
-        
-        symbols = config_data["sources"]["yahoo_finance"].get("symbols", [])
-        if symbol.upper() not in [s.upper() for s in symbols]:
-            symbols.append(symbol.upper())
-            config_data["sources"]["yahoo_finance"]["symbols"] = symbols
+        with self.edit_config() as config_data:
+            if "sources" not in config_data:
+                config_data["sources"] = {}
+            if "yahoo_finance" not in config_data["sources"]:
+                config_data["sources"]["yahoo_finance"] = {"enabled": True, "symbols": []}
             
-            if self.save_config(config_data):
-                print(f"Successfully added stock symbol: {symbol.upper()}")
-                return True
-        else:
-            print(f"Stock symbol '{symbol}' already exists")
-            return False
-        return False
+            symbols = config_data["sources"]["yahoo_finance"].setdefault("symbols", [])
+            # The list stays the on-disk form; the set only speeds up lookups.
+            symbol_index = self._index("config", lambda: {s.upper() for s in symbols})
+            if symbol.upper() in symbol_index:
+                print(f"Stock symbol '{symbol}' already exists")
+                return False
+            
+            symbol_index.add(symbol.upper())
+            symbols.append(symbol.upper())
+            self._dirty.add("config")
+        
+        return self._report("config", f"Successfully added stock symbol: {symbol.upper()}")
     
     def list_companies(self) -> None:
         """List all configured companies."""
@@ -212,7 +379,10 @@ class RetailXAIConfigEditor:
 
 def main():
     """Main function to run the configuration editor."""
-    editor = RetailXAIConfigEditor()
+    pretty_yaml = "--pretty-yaml" in sys.argv
+    if pretty_yaml:
+        sys.argv.remove("--pretty-yaml")
+    editor = RetailXAIConfigEditor(pretty_yaml=pretty_yaml)
     
     if len(sys.argv) < 2:
         print("RetailXAI Configuration Editor")
@@ -222,8 +392,11 @@ def main():
         print("  python edit_companies_sources.py list-sources")
         print("  python edit_companies_sources.py list-symbols")
         print("  python edit_companies_sources.py add-company 'Company Name'")
+        print("  python edit_companies_sources.py add-companies 'Company A' 'Company B' ...")
         print("  python edit_companies_sources.py add-source 'source_id' 'entity_id' 'youtube' 'channel_id'")
         print("  python edit_companies_sources.py add-symbol 'SYMBOL'")
+        print()
+        print("Add --pretty-yaml to write companies.yaml as block-style YAML instead of JSON.")
         return
     
     command = sys.argv[1].lower()
@@ -240,6 +413,11 @@ def main():
             return
         company_name = sys.argv[2]
         editor.add_company(company_name)
+    elif command == "add-companies":
+        if len(sys.argv) < 3:
+            print("Usage: add-companies 'Company A' 'Company B' ...")
+            return
+        editor.add_companies(sys.argv[2:])
     elif command == "add-source":
         if len(sys.argv) < 6:
             print("Usage: add-source 'source_id' 'entity_id' 'source_type' 'detail_key' 'detail_value'")
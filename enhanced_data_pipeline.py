@@ -10,6 +10,7 @@ import json
 import time
 import logging
 from datetime import datetime, timedelta
+from dataclasses import replace
 from dotenv import load_dotenv
 import yaml
 import threading
@@ -117,7 +118,7 @@ class EnhancedDataPipeline:
                     cur.execute("SELECT id FROM companies WHERE name = %s", (company.name,))
                     result = cur.fetchone()
                     if result:
-                        company.id = result[0]
+                        company = replace(company, id=result[0])
                         logger.info(f"✅ Company found: {company.name} (ID: {company.id})")
                     else:
                         logger.warning(f"❌ Company not found: {company.name}")
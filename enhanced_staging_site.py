@@ -2,16 +2,28 @@
 """
 Enhanced Staging Site
 Flask application for the enhanced staging dashboard with new data sources.
+
+Serve with threaded workers, e.g.
+    gunicorn -k gthread --threads 16 enhanced_staging_site:app
+Request threads may outnumber pooled connections; they wait for a free one.
 """
 
 import os
 import sys
-import json
+import gzip
+import hmac
+import hashlib
+import time
 import logging
+import functools
+import contextlib
+import threading
 from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, request
+import orjson
 import psycopg2
-from psycopg2 import pool
+from psycopg2 import pool, extensions
+from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -23,33 +35,372 @@ logger = logging.getLogger("RetailXAI.EnhancedStaging")
 
 app = Flask(__name__)
 
+# Characters of transcript/article content returned by the list endpoints
+CONTENT_PREVIEW_CHARS = 500
+
+# Most rows a listing endpoint returns; ?limit= can ask for fewer
+LISTING_LIMIT = 50
+
+# How far back /api/stats counts "recent" transcripts and analyses
+RECENT_ACTIVITY_WINDOW = timedelta(days=7)
+
+# Analysis columns holding JSON documents
+ANALYSIS_JSON_COLUMNS = ('metrics', 'strategy', 'trends', 'consumer_insights',
+                         'tech_observations', 'operations', 'outlook')
+
 # Database configuration
 DB_CONFIG = {
     'host': 'localhost',
     'name': 'retailxai',
     'user': 'retailxbt_user',
     'password': os.getenv('DATABASE_PASSWORD', 'Seattle2311'),
-    'min_connections': 1,
-    'max_connections': 5,
-    'connect_timeout': 10
+    'min_connections': int(os.getenv('DATABASE_MIN_CONNECTIONS', '2')),
+    'max_connections': int(os.getenv('DATABASE_MAX_CONNECTIONS', '10')),
+    'connect_timeout': 10,
+    # Detect connections dropped by stateful firewalls before a request uses them
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+    'statement_timeout_ms': 5000
+}
+
+# Endpoint queries, PREPAREd once per pooled connection so requests only
+# bind and execute. Parameters use PostgreSQL's $n placeholders.
+PREPARED_QUERIES = {
+    # JSON columns come back as text and are decoded per row (see
+    # _analyses) so one empty or malformed value cannot fail the query.
+    'get_analyses': ("integer", """
+        SELECT a.id,
+               a.metrics::text AS metrics,
+               a.strategy::text AS strategy,
+               a.trends::text AS trends,
+               a.consumer_insights::text AS consumer_insights,
+               a.tech_observations::text AS tech_observations,
+               a.operations::text AS operations,
+               a.outlook::text AS outlook,
+               t.title AS transcript_title, c.name as company_name
+        FROM analyses a
+        JOIN transcripts t ON a.transcript_id = t.id
+        JOIN companies c ON t.company_id = c.id
+        ORDER BY a.id DESC
+        LIMIT $1
+    """),
+    # Sentiment and outlook distributions over every analysis, so clients
+    # that list only a page of analyses can still show the totals
+    'get_analysis_summary': ("", """
+        SELECT
+            COUNT(*) FILTER (WHERE sentiment > 0),
+            COUNT(*) FILTER (WHERE sentiment = 0),
+            COUNT(*) FILTER (WHERE sentiment < 0),
+            COUNT(*) FILTER (WHERE forecast = 'bullish'),
+            COUNT(*) FILTER (WHERE forecast = 'bearish')
+        FROM (
+            SELECT CASE WHEN jsonb_typeof(metrics -> 'sentiment') = 'number'
+                        THEN (metrics ->> 'sentiment')::float END AS sentiment,
+                   outlook ->> 'forecast' AS forecast
+            FROM (
+                SELECT NULLIF(btrim(metrics::text), '')::jsonb AS metrics,
+                       NULLIF(btrim(outlook::text), '')::jsonb AS outlook
+                FROM analyses
+            ) j
+        ) a
+    """),
+    # Built as JSON text by Postgres (cast to text so psycopg2 does not
+    # decode it) and passed through to the response as-is.
+    'get_companies': ("", """
+        SELECT COALESCE(json_agg(json_build_object('id', id, 'name', name)
+                                 ORDER BY name), '[]')::text
+        FROM companies
+    """),
+    # $1 is the "recent activity" window, subtracted from the database's
+    # NOW() so the cutoff uses the session time zone published_at is stored
+    # in. The analyses count is a plain join aggregate so the planner can
+    # hash-join instead of filtering via IN.
+    'get_stats': ("interval", """
+        SELECT
+            (SELECT COUNT(*) FROM companies),
+            (SELECT COUNT(*) FROM transcripts),
+            (SELECT COUNT(*) FROM analyses),
+            (SELECT COUNT(*) FROM articles),
+            (SELECT COUNT(*) FROM transcripts WHERE published_at >= NOW() - $1),
+            (SELECT COUNT(*) FROM analyses a
+             JOIN transcripts t ON a.transcript_id = t.id
+             WHERE t.published_at >= NOW() - $1)
+    """),
+}
+
+# Content listings are read through named (server-side) cursors so client
+# memory stays bounded by STREAM_ITERSIZE however large the result grows.
+# DECLARE cannot wrap EXECUTE, so these are plain parameterized SQL.
+STREAM_ITERSIZE = 200
+STREAM_QUERIES = {
+    'get_transcripts': """
+        SELECT t.id, t.title, LEFT(t.content, %(chars)s) AS content,
+               length(t.content) > %(chars)s AS truncated,
+               t.published_at, c.name as company_name
+        FROM transcripts t
+        JOIN companies c ON t.company_id = c.id
+        ORDER BY t.published_at DESC
+        LIMIT %(limit)s
+    """,
+    'get_articles': """
+        SELECT id, title, LEFT(content, %(chars)s) AS content,
+               length(content) > %(chars)s AS truncated,
+               published_at, company_id
+        FROM articles
+        ORDER BY published_at DESC
+        LIMIT %(limit)s
+    """,
 }
 
+class PreparingConnection(extensions.connection):
+    """Connection that PREPAREs each endpoint query the first time it runs it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+    def execute_prepared(self, cur, name, params=()):
+        if name not in self.prepared:
+            arg_types, sql = PREPARED_QUERIES[name]
+            signature = f"({arg_types})" if arg_types else ""
+            cur.execute(f"PREPARE {name}{signature} AS {sql}")
+            self.prepared.add(name)
+        placeholders = f"({', '.join(['%s'] * len(params))})" if params else ""
+        cur.execute(f"EXECUTE {name}{placeholders}", params or None)
+
+def _execute_prepared(cur, name, *params):
+    """Run a prepared endpoint query on `cur`."""
+    cur.connection.execute_prepared(cur, name, params)
+
 # Initialize connection pool
 try:
-    connection_pool = psycopg2.pool.SimpleConnectionPool(
+    connection_pool = psycopg2.pool.ThreadedConnectionPool(
         DB_CONFIG['min_connections'],
         DB_CONFIG['max_connections'],
         host=DB_CONFIG['host'],
         database=DB_CONFIG['name'],
         user=DB_CONFIG['user'],
         password=DB_CONFIG['password'],
-        connect_timeout=DB_CONFIG['connect_timeout']
+        connect_timeout=DB_CONFIG['connect_timeout'],
+        keepalives=1,
+        keepalives_idle=DB_CONFIG['keepalives_idle'],
+        keepalives_interval=DB_CONFIG['keepalives_interval'],
+        keepalives_count=DB_CONFIG['keepalives_count'],
+        options=f"-c statement_timeout={DB_CONFIG['statement_timeout_ms']}",
+        connection_factory=PreparingConnection
     )
+    # The pool opens min_connections eagerly, so the first request does not
+    # pay the connect/auth handshake. Behind pgbouncer (transaction pooling)
+    # keep max_connections small; it does the multiplexing.
     logger.info("Database connection pool initialized successfully")
 except Exception as e:
     logger.error(f"Failed to initialize database connection pool: {e}")
     connection_pool = None
 
+# ThreadedConnectionPool raises as soon as it is exhausted; this lets extra
+# request threads queue for a connection instead.
+_connection_slots = threading.BoundedSemaphore(DB_CONFIG['max_connections'])
+
+@contextlib.contextmanager
+def _db():
+    """Borrow a pooled connection for the duration of the block."""
+    if not _connection_slots.acquire(timeout=DB_CONFIG['connect_timeout']):
+        raise psycopg2.pool.PoolError("timed out waiting for a database connection")
+    try:
+        conn = connection_pool.getconn()
+        try:
+            yield conn
+        finally:
+            connection_pool.putconn(conn)
+    finally:
+        _connection_slots.release()
+
+# JSON bodies smaller than this go out uncompressed; the gzip framing would
+# eat most of the saving
+GZIP_MIN_BYTES = 1024
+
+@app.after_request
+def _finish_json(response):
+    """Tag JSON responses with an ETag and gzip them for clients that accept it.
+
+    A request whose If-None-Match matches gets a bodyless 304. Fallback
+    responses marked no-store are never tagged.
+    """
+    if response.mimetype != 'application/json' or response.direct_passthrough:
+        return response
+    if not response.cache_control.no_store:
+        # Weak, since the same tag covers the gzipped and plain encodings.
+        # Views whose bodies carry request timestamps set their own tag.
+        if 'ETag' not in response.headers:
+            response.add_etag(weak=True)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+    if ('Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=5))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def ojson(data):
+    """JSON response encoded with orjson; datetimes are serialized natively."""
+    return Response(orjson.dumps(data), mimetype='application/json')
+
+# Keys stamped with the request time (health timestamp, stats last_updated)
+VOLATILE_KEYS = frozenset({'timestamp', 'last_updated'})
+
+def _without_volatile(data):
+    """`data` with VOLATILE_KEYS dropped from it and from any nested dicts."""
+    if not isinstance(data, dict):
+        return data
+    return {k: _without_volatile(v) for k, v in data.items() if k not in VOLATILE_KEYS}
+
+def ojson_stamped(data):
+    """ojson() for payloads carrying request timestamps.
+
+    The ETag covers the data without its VOLATILE_KEYS, so a client that
+    sends If-None-Match gets a 304 until the data itself changes.
+    """
+    response = ojson(data)
+    payload = orjson.dumps(_without_volatile(data), option=orjson.OPT_SORT_KEYS)
+    response.set_etag(hashlib.blake2b(payload, digest_size=16).hexdigest(), weak=True)
+    return response
+
+# Token /api/cache/flush requires in X-Admin-Token. When unset, flushes are
+# refused unless the app runs in debug mode.
+CACHE_FLUSH_TOKEN = os.getenv('CACHE_FLUSH_TOKEN', '')
+
+# Per-view response caches, cleared by /api/cache/flush. They live in each
+# worker process, so a flush only clears the worker that handles it.
+_response_caches = []
+
+def _ttl_cache(seconds):
+    """Serve a view's encoded JSON body from memory for `seconds` after computing it.
+
+    Responses marked no-store (error fallbacks) are never cached.
+    """
+    def decorator(view):
+        cache = {}
+        _response_caches.append(cache)
+
+        @functools.wraps(view)
+        def wrapper():
+            entry = cache.get('body')
+            if entry and entry[0] > time.monotonic():
+                response = Response(entry[1], mimetype='application/json')
+                if entry[2]:
+                    response.headers['ETag'] = entry[2]
+                return response
+            response = view()
+            if not response.cache_control.no_store:
+                cache['body'] = (time.monotonic() + seconds, response.get_data(),
+                                 response.headers.get('ETag'))
+            return response
+        return wrapper
+    return decorator
+
+def _uncached(response):
+    """Mark a fallback response so neither _ttl_cache nor clients keep it."""
+    response.cache_control.no_store = True
+    return response
+
+def _finish_preview(row):
+    """Mark a content preview that SQL truncated."""
+    if row.pop('truncated'):
+        row['content'] += '...'
+    return row
+
+def _listing_limit():
+    """Rows requested by ?limit=, clamped to 1..LISTING_LIMIT."""
+    limit = request.args.get('limit', LISTING_LIMIT, type=int)
+    return max(1, min(limit, LISTING_LIMIT))
+
+def _stream_previews(conn, name, limit):
+    """Run a STREAM_QUERIES listing on a server-side cursor and finish its previews."""
+    with conn.cursor(name=name, cursor_factory=RealDictCursor) as cur:
+        cur.itersize = STREAM_ITERSIZE
+        cur.execute(STREAM_QUERIES[name], {'chars': CONTENT_PREVIEW_CHARS, 'limit': limit})
+        return [_finish_preview(row) for row in cur]
+
+def _json_or_empty(text):
+    """Decode a JSON column, falling back to {} for NULL, empty or malformed text."""
+    if not text:
+        return {}
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return {}
+
+def _analyses(conn, limit):
+    """Recent analyses with their JSON columns decoded to dicts."""
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        _execute_prepared(cur, 'get_analyses', limit)
+        rows = cur.fetchall()
+    for row in rows:
+        for column in ANALYSIS_JSON_COLUMNS:
+            row[column] = _json_or_empty(row[column])
+    return rows
+
+def _analysis_summary(conn):
+    """Sentiment and outlook counts across all analyses."""
+    with conn.cursor() as cur:
+        _execute_prepared(cur, 'get_analysis_summary')
+        positive, neutral, negative, bullish, bearish = cur.fetchone()
+    
+    return {
+        'positive': positive,
+        'neutral': neutral,
+        'negative': negative,
+        'bullish': bullish,
+        'bearish': bearish
+    }
+
+def _analysis_summary_or_none(conn):
+    """_analysis_summary(), or None when it fails.
+
+    The query runs under a savepoint, so a failure (one unparseable
+    analysis row, say) leaves the caller's transaction usable.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SAVEPOINT analysis_summary")
+        try:
+            summary = _analysis_summary(conn)
+        except psycopg2.Error as e:
+            logger.error(f"Error computing analysis summary: {e}")
+            cur.execute("ROLLBACK TO SAVEPOINT analysis_summary")
+            return None
+        cur.execute("RELEASE SAVEPOINT analysis_summary")
+    return summary
+
+def _companies_json(conn):
+    """All companies as a JSON array built by Postgres."""
+    with conn.cursor() as cur:
+        _execute_prepared(cur, 'get_companies')
+        return cur.fetchone()[0]
+
+def _stats(conn):
+    """System statistics, all counts in one round-trip."""
+    with conn.cursor() as cur:
+        _execute_prepared(cur, 'get_stats', RECENT_ACTIVITY_WINDOW)
+        (company_count, transcript_count, analysis_count, article_count,
+         recent_transcripts, recent_analyses) = cur.fetchone()
+    
+    return {
+        'companies': company_count,
+        'transcripts': transcript_count,
+        'analyses': analysis_count,
+        'articles': article_count,
+        'recent_transcripts': recent_transcripts,
+        'recent_analyses': recent_analyses,
+        'last_updated': datetime.now()
+    }
+
 @app.route('/')
 def index():
     """Main dashboard page."""
@@ -59,204 +410,160 @@ def index():
 def get_transcripts():
     """Get recent transcripts."""
     if not connection_pool:
-        return jsonify([])
+        return ojson([])
     
-    conn = connection_pool.getconn()
     try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT t.id, t.title, t.content, t.published_at, c.name as company_name
-                FROM transcripts t
-                JOIN companies c ON t.company_id = c.id
-                ORDER BY t.published_at DESC
-                LIMIT 50
-            """)
-            transcripts = []
-            for row in cur.fetchall():
-                transcripts.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'content': row[2][:500] + '...' if len(row[2]) > 500 else row[2],
-                    'published_at': row[3].isoformat() if row[3] else None,
-                    'company_name': row[4]
-                })
-            return jsonify(transcripts)
+        with _db() as conn:
+            # Truncate in SQL so full transcript bodies never cross the wire
+            return ojson(_stream_previews(conn, 'get_transcripts', _listing_limit()))
     except Exception as e:
         logger.error(f"Error fetching transcripts: {e}")
-        return jsonify([])
-    finally:
-        connection_pool.putconn(conn)
+        return ojson([])
 
 @app.route('/api/analyses')
 def get_analyses():
     """Get recent analyses."""
     if not connection_pool:
-        return jsonify([])
+        return ojson([])
     
-    conn = connection_pool.getconn()
     try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT a.id, a.metrics, a.strategy, a.trends, a.consumer_insights, 
-                       a.tech_observations, a.operations, a.outlook, t.title, c.name as company_name
-                FROM analyses a
-                JOIN transcripts t ON a.transcript_id = t.id
-                JOIN companies c ON t.company_id = c.id
-                ORDER BY a.id DESC
-                LIMIT 50
-            """)
-            analyses = []
-            for row in cur.fetchall():
-                try:
-                    analyses.append({
-                        'id': row[0],
-                        'metrics': json.loads(row[1]) if row[1] else {},
-                        'strategy': json.loads(row[2]) if row[2] else {},
-                        'trends': json.loads(row[3]) if row[3] else {},
-                        'consumer_insights': json.loads(row[4]) if row[4] else {},
-                        'tech_observations': json.loads(row[5]) if row[5] else {},
-                        'operations': json.loads(row[6]) if row[6] else {},
-                        'outlook': json.loads(row[7]) if row[7] else {},
-                        'transcript_title': row[8],
-                        'company_name': row[9]
-                    })
-                except json.JSONDecodeError:
-                    continue
-            return jsonify(analyses)
+        with _db() as conn:
+            return ojson(_analyses(conn, _listing_limit()))
     except Exception as e:
         logger.error(f"Error fetching analyses: {e}")
-        return jsonify([])
-    finally:
-        connection_pool.putconn(conn)
+        return ojson([])
+
+@app.route('/api/analyses/summary')
+@_ttl_cache(30)
+def get_analysis_summary():
+    """Get sentiment and outlook distributions across all analyses."""
+    if not connection_pool:
+        return _uncached(ojson({}))
+    
+    try:
+        with _db() as conn:
+            return ojson(_analysis_summary(conn))
+    except Exception as e:
+        logger.error(f"Error fetching analysis summary: {e}")
+        return _uncached(ojson({}))
 
 @app.route('/api/articles')
 def get_articles():
     """Get recent articles."""
     if not connection_pool:
-        return jsonify([])
+        return ojson([])
     
-    conn = connection_pool.getconn()
     try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, title, content, published_at, company_id
-                FROM articles
-                ORDER BY published_at DESC
-                LIMIT 50
-            """)
-            articles = []
-            for row in cur.fetchall():
-                articles.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'content': row[2][:500] + '...' if len(row[2]) > 500 else row[2],
-                    'published_at': row[3].isoformat() if row[3] else None,
-                    'company_id': row[4]
-                })
-            return jsonify(articles)
+        with _db() as conn:
+            return ojson(_stream_previews(conn, 'get_articles', _listing_limit()))
     except Exception as e:
         logger.error(f"Error fetching articles: {e}")
-        return jsonify([])
-    finally:
-        connection_pool.putconn(conn)
+        return ojson([])
 
 @app.route('/api/companies')
+@_ttl_cache(60)
 def get_companies():
     """Get all companies."""
     if not connection_pool:
-        return jsonify([])
+        return _uncached(ojson([]))
     
-    conn = connection_pool.getconn()
     try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id, name FROM companies ORDER BY name")
-            companies = [{'id': row[0], 'name': row[1]} for row in cur.fetchall()]
-            return jsonify(companies)
+        with _db() as conn:
+            return Response(_companies_json(conn), mimetype='application/json')
     except Exception as e:
         logger.error(f"Error fetching companies: {e}")
-        return jsonify([])
-    finally:
-        connection_pool.putconn(conn)
+        return _uncached(ojson([]))
 
 @app.route('/api/stats')
+@_ttl_cache(30)
 def get_stats():
     """Get system statistics."""
     if not connection_pool:
-        return jsonify({})
+        return _uncached(ojson({}))
     
-    conn = connection_pool.getconn()
     try:
-        with conn.cursor() as cur:
-            # Get counts
-            cur.execute("SELECT COUNT(*) FROM companies")
-            company_count = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM transcripts")
-            transcript_count = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM analyses")
-            analysis_count = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM articles")
-            article_count = cur.fetchone()[0]
-            
-            # Get recent activity
-            cur.execute("""
-                SELECT COUNT(*) FROM transcripts 
-                WHERE published_at >= NOW() - INTERVAL '7 days'
-            """)
-            recent_transcripts = cur.fetchone()[0]
-            
-            cur.execute("""
-                SELECT COUNT(*) FROM analyses 
-                WHERE id IN (
-                    SELECT a.id FROM analyses a
-                    JOIN transcripts t ON a.transcript_id = t.id
-                    WHERE t.published_at >= NOW() - INTERVAL '7 days'
-                )
-            """)
-            recent_analyses = cur.fetchone()[0]
-            
-            return jsonify({
-                'companies': company_count,
-                'transcripts': transcript_count,
-                'analyses': analysis_count,
-                'articles': article_count,
-                'recent_transcripts': recent_transcripts,
-                'recent_analyses': recent_analyses,
-                'last_updated': datetime.now().isoformat()
-            })
+        with _db() as conn:
+            return ojson_stamped(_stats(conn))
     except Exception as e:
         logger.error(f"Error fetching stats: {e}")
-        return jsonify({})
-    finally:
-        connection_pool.putconn(conn)
+        return _uncached(ojson({}))
+
+@app.route('/api/dashboard')
+def get_dashboard():
+    """Everything the static dashboard shows, in one response.
+
+    Every listing is read on one connection, inside one transaction, so the
+    static site build needs a single request instead of one per endpoint.
+    ?limit= applies to the transcript, analysis and article listings.
+    analysis_summary is null when the distributions could not be computed.
+    """
+    if not connection_pool:
+        return _uncached(ojson({}))
+    
+    try:
+        limit = _listing_limit()
+        with _db() as conn:
+            return ojson_stamped({
+                'transcripts': _stream_previews(conn, 'get_transcripts', limit),
+                'analyses': _analyses(conn, limit),
+                'analysis_summary': _analysis_summary_or_none(conn),
+                'articles': _stream_previews(conn, 'get_articles', limit),
+                # Already JSON text; embedded without a decode/encode pass
+                'companies': orjson.Fragment(_companies_json(conn)),
+                'stats': _stats(conn),
+                'health': {
+                    'status': 'healthy',
+                    'database': 'connected',
+                    'timestamp': datetime.now()
+                }
+            })
+    except Exception as e:
+        logger.error(f"Error fetching dashboard: {e}")
+        return _uncached(ojson({}))
+
+@app.route('/api/cache/flush', methods=['POST'])
+def flush_cache():
+    """Drop this worker's cached API responses.
+
+    Requires an X-Admin-Token header matching CACHE_FLUSH_TOKEN; without a
+    configured token only the debug server accepts flushes. The caches are
+    per process, so under gunicorn each worker must be flushed (or restarted)
+    separately.
+    """
+    if CACHE_FLUSH_TOKEN:
+        token = request.headers.get('X-Admin-Token', '')
+        authorized = hmac.compare_digest(token, CACHE_FLUSH_TOKEN)
+    else:
+        authorized = app.debug
+    if not authorized:
+        logger.warning(f"Rejected cache flush from {request.remote_addr}")
+        return ojson({'error': 'forbidden'}), 403
+    for cache in _response_caches:
+        cache.clear()
+    return ojson({'status': 'flushed'})
 
 @app.route('/api/health')
 def health_check():
     """Health check endpoint."""
     if not connection_pool:
-        return jsonify({'status': 'unhealthy', 'database': 'disconnected'})
+        return ojson({'status': 'unhealthy', 'database': 'disconnected'})
     
-    conn = connection_pool.getconn()
     try:
-        with conn.cursor() as cur:
+        with _db() as conn, conn.cursor() as cur:
             cur.execute("SELECT 1")
-            return jsonify({
+            return ojson_stamped({
                 'status': 'healthy',
                 'database': 'connected',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now()
             })
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return jsonify({
+        return ojson({
             'status': 'unhealthy',
             'database': 'error',
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now()
         })
-    finally:
-        connection_pool.putconn(conn)
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
@@ -3,16 +3,17 @@ from datetime import datetime
 from typing import Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Company:
     """Represents a company with data source details."""
     name: str
     youtube_channels: List[str]
     rss_feed: Optional[str]
     keywords: List[str]
+    id: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Transcript:
     """Represents a transcript from a video or press release."""
     content: str
@@ -23,7 +24,7 @@ class Transcript:
     source_type: str  # 'youtube' or 'rss'
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Analysis:
     """Represents an analysis result from Claude."""
     metrics: Dict
@@ -38,7 +39,7 @@ class Analysis:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Article:
     """Represents a generated news article."""
     headline: str
@@ -48,7 +49,7 @@ class Article:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Tweet:
     """Represents a single tweet in a thread."""
     text: str
@@ -1,141 +1,72 @@
 #!/usr/bin/env python3
 """
 Fix production database schema to match staging site expectations.
-This script connects to the production server and updates the database schema.
+This script connects directly to the production database (DATABASE_URL)
+and updates the schema.
 """
 
 import os
 import sys
-import json
-import requests
-from datetime import datetime, timedelta
-from dotenv import load_dotenv
-import yaml
+import functools
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Production server, for the manual recovery steps
+PRODUCTION_HOST = '143.198.14.56'
+SSH_TARGET = f'root@{PRODUCTION_HOST}'
+
+CONFIG_FILE = 'config/config.yaml'
+COMPANIES_FILE = 'config/companies.yaml'
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema', '001_initial.sql')
+
+# Third-party modules (yaml, dotenv, psycopg2) are imported by the steps that
+# use them, so running one step does not pay for the others' imports.
+
+@functools.lru_cache(maxsize=4)
+def _load_yaml(path, mtime_ns):
+    """Parse a YAML file; cached per (path, mtime) so edits invalidate it."""
+    import yaml
+    # libyaml's C loader when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
+def _connect():
+    """Open a connection to the production database named by DATABASE_URL."""
+    import psycopg2
+    return psycopg2.connect(os.environ['DATABASE_URL'])
+
+def _read_schema():
+    """Return the schema migration DDL."""
+    with open(SCHEMA_FILE, encoding='utf-8') as f:
+        return f.read()
+
 def load_config():
     """Load configuration files."""
-    with open('config/config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
-    
-    with open('config/companies.yaml', 'r') as f:
-        companies_config = yaml.safe_load(f)
-    
+    config = _load_yaml(CONFIG_FILE, os.stat(CONFIG_FILE).st_mtime_ns)
+    companies_config = _load_yaml(COMPANIES_FILE, os.stat(COMPANIES_FILE).st_mtime_ns)
     return config, companies_config
 
 def create_database_schema():
-    """Create the proper database schema on production server."""
-    print("🔧 Creating database schema on production server...")
+    """Create the proper database schema on the production database."""
+    print("🔧 Creating database schema on production database...")
     
-    # SQL commands to create the proper schema
-    schema_commands = [
-        # Create companies table
-        """
-        CREATE TABLE IF NOT EXISTS companies (
-            id SERIAL PRIMARY KEY,
-            name VARCHAR(255) NOT NULL UNIQUE,
-            youtube_channels TEXT[],
-            rss_feed TEXT,
-            keywords TEXT[],
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """,
-        
-        # Create transcripts table
-        """
-        CREATE TABLE IF NOT EXISTS transcripts (
-            id SERIAL PRIMARY KEY,
-            company_id INTEGER REFERENCES companies(id),
-            video_id VARCHAR(255),
-            title TEXT,
-            content TEXT,
-            published_at TIMESTAMP,
-            channel_id VARCHAR(255),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """,
-        
-        # Create analyses table
-        """
-        CREATE TABLE IF NOT EXISTS analyses (
-            id SERIAL PRIMARY KEY,
-            company_id INTEGER REFERENCES companies(id),
-            transcript_id INTEGER REFERENCES transcripts(id),
-            analysis_type VARCHAR(100),
-            analysis_data JSONB,
-            summary TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """,
-        
-        # Create articles table
-        """
-        CREATE TABLE IF NOT EXISTS articles (
-            id SERIAL PRIMARY KEY,
-            company_id INTEGER REFERENCES companies(id),
-            analysis_id INTEGER REFERENCES analyses(id),
-            title TEXT,
-            content TEXT,
-            article_data JSONB,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """,
-        
-        # Create health_checks table
-        """
-        CREATE TABLE IF NOT EXISTS health_checks (
-            id SERIAL PRIMARY KEY,
-            check_type VARCHAR(100),
-            status VARCHAR(50),
-            message TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """,
-        
-        # Create agent_states table
-        """
-        CREATE TABLE IF NOT EXISTS agent_states (
-            id SERIAL PRIMARY KEY,
-            agent_name VARCHAR(100),
-            is_running BOOLEAN DEFAULT FALSE,
-            last_execution TIMESTAMP,
-            status_message TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """
-    ]
+    ddl = _read_schema()
+    print(f"  📝 Executing {os.path.basename(SCHEMA_FILE)}...")
     
-    # Execute schema commands via SSH
-    for i, command in enumerate(schema_commands, 1):
-        print(f"  📝 Executing schema command {i}/{len(schema_commands)}...")
-        
-        # Create a temporary SQL file
-        sql_file = f"temp_schema_{i}.sql"
-        with open(sql_file, 'w') as f:
-            f.write(command)
-        
-        # Execute via SSH
-        try:
-            import subprocess
-            result = subprocess.run([
-                'ssh', 'root@143.198.14.56', 
-                f'cd /home/retailxai/precipice && psql -U retailxbt_user -d retailxai -f - < {sql_file}'
-            ], input=command, text=True, capture_output=True, timeout=30)
-            
-            if result.returncode == 0:
-                print(f"    ✅ Schema command {i} executed successfully")
-            else:
-                print(f"    ⚠️  Schema command {i} warning: {result.stderr}")
-                
-        except Exception as e:
-            print(f"    ❌ Schema command {i} failed: {e}")
-        finally:
-            # Clean up temp file
-            if os.path.exists(sql_file):
-                os.remove(sql_file)
+    # The whole script goes over in one round-trip and one transaction
+    conn = None
+    try:
+        conn = _connect()
+        with conn, conn.cursor() as cur:
+            cur.execute(ddl)
+        print("    ✅ Schema commands executed successfully")
+    except Exception as e:
+        print(f"    ❌ Schema commands failed: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
     
     print("✅ Database schema creation completed")
 
@@ -143,58 +74,62 @@ def populate_companies(companies_config):
     """Populate companies table with test data."""
     print("🏢 Populating companies table...")
     
+    rows = []
     for company_data in companies_config['companies']:
         print(f"  📝 Adding company: {company_data['name']}")
-        
-        # Create SQL insert command
-        insert_sql = f"""
-        INSERT INTO companies (name, youtube_channels, rss_feed, keywords) 
-        VALUES ('{company_data['name']}', 
-                ARRAY{company_data.get('youtube_channels', [])}, 
-                '{company_data.get('rss_feed', '')}', 
-                ARRAY{company_data.get('keywords', [])})
-        ON CONFLICT (name) DO NOTHING;
-        """
-        
-        try:
-            import subprocess
-            result = subprocess.run([
-                'ssh', 'root@143.198.14.56', 
-                'cd /home/retailxai/precipice && psql -U retailxbt_user -d retailxai -c',
-                insert_sql
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                print(f"    ✅ Company {company_data['name']} added successfully")
-            else:
-                print(f"    ⚠️  Company {company_data['name']} warning: {result.stderr}")
-                
-        except Exception as e:
-            print(f"    ❌ Company {company_data['name']} failed: {e}")
+        rows.append((
+            company_data['name'],
+            company_data.get('youtube_channels', []),
+            company_data.get('rss_feed', ''),
+            company_data.get('keywords', [])
+        ))
+    
+    # One parameterized, batched insert over a direct connection
+    conn = None
+    try:
+        from psycopg2.extras import execute_values
+        conn = _connect()
+        with conn, conn.cursor() as cur:
+            execute_values(cur, """
+                INSERT INTO companies (name, youtube_channels, rss_feed, keywords)
+                VALUES %s
+                ON CONFLICT (name) DO NOTHING
+            """, rows, template="(%s, %s::text[], %s, %s::text[])")
+        print(f"    ✅ {len(rows)} companies added successfully")
+    except Exception as e:
+        print(f"    ❌ Companies failed: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
 
 def test_database_connection():
     """Test if the database is working properly."""
     print("🔍 Testing database connection...")
     
+    conn = None
     try:
-        response = requests.get('http://143.198.14.56:5000/api/companies', timeout=10)
-        if response.status_code == 200:
-            companies = response.json()
-            print(f"✅ Database connection working - found {len(companies)} companies")
-            return True
-        else:
-            print(f"❌ Database connection failed: {response.status_code}")
-            return False
+        conn = _connect()
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM companies")
+            company_count = cur.fetchone()[0]
+        print(f"✅ Database connection working - found {company_count} companies")
+        return True
     except Exception as e:
         print(f"❌ Database connection error: {e}")
         return False
+    finally:
+        if conn is not None:
+            conn.close()
 
 def main():
     """Main function to fix production database."""
     print("🚀 Fixing Production Database Schema")
     print("=" * 50)
     
+    from dotenv import load_dotenv
+    
     # Load configuration
+    load_dotenv('config/.env')
     config, companies_config = load_config()
     
     # Create database schema
@@ -211,7 +146,7 @@ def main():
     else:
         print("\n❌ Database fix failed. Please check the production server manually.")
         print("🔧 Manual steps:")
-        print("1. SSH to production server: ssh root@143.198.14.56")
+        print(f"1. SSH to production server: ssh {SSH_TARGET}")
         print("2. Check database: psql -U retailxbt_user -d retailxai")
         print("3. Verify tables: \\dt")
 
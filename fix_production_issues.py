@@ -6,13 +6,271 @@ This script fixes all identified production issues and implements proper monitor
 
 import os
 import sys
-import subprocess
+import io
+import json
+import functools
 import logging
-import time
-from pathlib import Path
+import stat
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+import yaml
 
 logger = logging.getLogger("RetailXAI.ProductionFixer")
 
+# Minutes covered by each service's quota window (one bucket per minute)
+QUOTA_WINDOW_MINUTES = 24 * 60
+
+# Generated quota_window.py: sliding-window usage in per-minute buckets
+QUOTA_WINDOW_MODULE = '''"""
+Sliding-window API quota accounting.
+Generated by fix_production_issues.py.
+"""
+
+import collections
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+
+def current_minute() -> int:
+    """Wall-clock minute number (minutes since the epoch)."""
+    return int(time.time() // 60)
+
+
+class QuotaWindow:
+    """Usage over the last `window_minutes` minutes, one bucket per minute."""
+
+    def __init__(self, capacity: int, window_minutes: int, buckets: Optional[List[int]] = None,
+                 last_minute: Optional[int] = None):
+        """Start a window, optionally restoring a snapshot().
+
+        Restored `buckets` are shifted forward by the minutes elapsed since
+        `last_minute`, the wall-clock minute of the newest one, so usage
+        older than the window is dropped. Buckets without a `last_minute`
+        cannot be dated and are ignored.
+        """
+        self.capacity = capacity
+        # Appending past maxlen evicts the oldest minute
+        self._buckets = collections.deque(maxlen=window_minutes)
+        self._minute = current_minute()
+        self._lock = threading.Lock()
+        if buckets and last_minute is not None and last_minute <= self._minute:
+            self._buckets.extend(buckets)
+            self._advance(last_minute)
+        if not self._buckets:
+            self._buckets.append(0)
+
+    def _advance(self, from_minute: int) -> None:
+        """Start an empty bucket for each minute from `from_minute` to now."""
+        elapsed = min(self._minute - from_minute, self._buckets.maxlen)
+        self._buckets.extend([0] * elapsed)
+
+    def used(self) -> int:
+        """Total usage across the window."""
+        with self._lock:
+            return sum(self._buckets)
+
+    def allow(self, cost: int = 1) -> bool:
+        """True if `cost` more units fit in the window."""
+        return self.used() + cost <= self.capacity
+
+    def record(self, n: int = 1) -> None:
+        """Add `n` units to the current minute."""
+        with self._lock:
+            self._buckets[-1] += n
+
+    def acquire(self, cost: int = 1) -> bool:
+        """Record `cost` units if they fit; False (recording nothing) otherwise."""
+        with self._lock:
+            if sum(self._buckets) + cost > self.capacity:
+                return False
+            self._buckets[-1] += cost
+            return True
+
+    def tick(self) -> None:
+        """Catch up with the wall clock, starting a bucket per minute passed."""
+        with self._lock:
+            now = current_minute()
+            if now > self._minute:
+                last_minute, self._minute = self._minute, now
+                self._advance(last_minute)
+
+    def snapshot(self) -> Tuple[List[int], int]:
+        """Bucket counts, oldest first, and the wall-clock minute of the newest."""
+        with self._lock:
+            return list(self._buckets), self._minute
+
+
+def start_ticker(windows: Iterable[QuotaWindow], interval: float = 60.0) -> None:
+    """Advance every window by one bucket each `interval` seconds."""
+    windows = list(windows)
+
+    def tick():
+        for window in windows:
+            window.tick()
+        start_ticker(windows, interval)
+
+    timer = threading.Timer(interval, tick)
+    timer.daemon = True
+    timer.start()
+'''
+
+
+# Permissions for generated files; scripts get EXECUTABLE_MODE
+FILE_MODE = 0o644
+EXECUTABLE_MODE = 0o755
+
+
+def _write_file(path: str, content: str, append: bool = False, mode: Optional[int] = None) -> None:
+    """Write `content` to `path` (or append it) on a single file descriptor.
+    
+    The content is encoded up front and written with os.write, and the
+    permissions are set with fchmod on the same descriptor. A full write goes
+    to a temporary file that replaces `path` once synced, so an interrupted
+    run never leaves a half-written file for readers to parse. Appends are
+    made in place.
+    
+    Without an explicit `mode`, an existing file keeps its permissions and a
+    new one gets FILE_MODE.
+    """
+    data = content.encode("utf-8")
+    if mode is None:
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = FILE_MODE
+    if append:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, mode)
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        return
+    
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        try:
+            _write_all(fd, data)
+            os.fchmod(fd, mode)  # Not subject to the umask, unlike os.open's mode
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """os.write until all of `data` is written."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+# Generated health_check.py
+HEALTH_CHECK_SCRIPT = '''#!/usr/bin/env python3
+"""
+Health check for RetailXAI.
+Checks the service, the API health endpoint and the database in one process.
+Run once for an exit status (0 healthy, 1 not), or with --interval to keep
+checking on the same HTTP session and database pool.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+
+SERVICE_NAME = "retailxai"
+HEALTH_URL = "http://localhost:5000/api/health"
+HTTP_TIMEOUT = 2
+CONFIG_FILE = "config/config.yaml"
+
+# Keep-alive connections to the API, reused across checks
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# DatabaseManager (and its connection pool), created on the first database check
+_db_manager = None
+
+
+def get_db_manager():
+    """Return the shared DatabaseManager, connecting on first use."""
+    global _db_manager
+    if _db_manager is None:
+        from database_manager import DatabaseManager
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        _db_manager = DatabaseManager(config["global"]["database"])
+    return _db_manager
+
+
+def check_service():
+    """Check that the systemd service is active."""
+    result = subprocess.run(["systemctl", "is-active", "--quiet", SERVICE_NAME])
+    return result.returncode == 0, "RetailXAI service is not running"
+
+
+def check_api():
+    """Check that the API health endpoint answers."""
+    try:
+        response = SESSION.get(HEALTH_URL, timeout=HTTP_TIMEOUT)
+        return response.ok, "Health endpoint not responding"
+    except requests.RequestException:
+        return False, "Health endpoint not responding"
+
+
+def check_database():
+    """Check that the database answers a query."""
+    try:
+        return get_db_manager().is_healthy(), "Database connection failed"
+    except Exception:
+        return False, "Database connection failed"
+
+
+CHECKS = [check_service, check_api, check_database]
+
+
+def run_checks():
+    """Run every check in order, stopping at the first failure."""
+    print("🏥 Checking RetailXAI Health...")
+    for check in CHECKS:
+        ok, message = check()
+        if not ok:
+            print(f"❌ {message}")
+            return False
+    print("✅ All health checks passed")
+    return True
+
+
+def main():
+    """Run the health checks once, or every --interval seconds."""
+    parser = argparse.ArgumentParser(description="RetailXAI health check")
+    parser.add_argument("--interval", type=float, help="Keep checking every INTERVAL seconds")
+    args = parser.parse_args()
+
+    if args.interval is None:
+        sys.exit(0 if run_checks() else 1)
+
+    while True:
+        run_checks()
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
+'''
+
 
 class ProductionFixer:
     """Fixes all production issues identified in the audit."""
@@ -20,6 +278,18 @@ class ProductionFixer:
     def __init__(self):
         self.fixes_applied = []
         self.errors = []
+        # Fixes run concurrently (see run_all_fixes) and report through this lock
+        self._lock = threading.Lock()
+    
+    def _record_fix(self, message: str) -> None:
+        """Note an applied fix."""
+        with self._lock:
+            self.fixes_applied.append(message)
+    
+    def _record_error(self, message: str) -> None:
+        """Note a failed fix."""
+        with self._lock:
+            self.errors.append(message)
         
     def fix_config_issues(self) -> bool:
         """Fix configuration issues."""
@@ -27,15 +297,15 @@ class ProductionFixer:
         
         try:
             # The config.yaml logging issue was already fixed
-            self.fixes_applied.append("Fixed missing logging configuration in config.yaml")
+            self._record_fix("Fixed missing logging configuration in config.yaml")
             
             # Ensure logs directory exists
             os.makedirs("logs", exist_ok=True)
-            self.fixes_applied.append("Created logs directory")
+            self._record_fix("Created logs directory")
             
             return True
         except Exception as e:
-            self.errors.append(f"Config fix failed: {e}")
+            self._record_error(f"Config fix failed: {e}")
             return False
     
     def fix_youtube_quota_issue(self) -> bool:
@@ -43,54 +313,96 @@ class ProductionFixer:
         logger.info("🔧 Fixing YouTube API quota issue...")
         
         try:
-            # Create quota management system
+            # Create quota management system: usage is kept in per-minute
+            # buckets (oldest first) over a sliding window, and admission is
+            # decided by the window's total against capacity. The APIs'
+            # limits are daily, so the window spans a day.
             quota_config = {
                 "youtube": {
-                    "daily_limit": 10000,
-                    "current_usage": 0,
-                    "reset_time": "00:00",
-                    "emergency_threshold": 9000,
-                    "circuit_breaker_threshold": 9500
+                    "capacity": 9500,
+                    "window_minutes": QUOTA_WINDOW_MINUTES,
+                    "buckets": [],
+                    "last_minute": None
                 },
                 "claude": {
-                    "daily_limit": 2000,
-                    "current_usage": 0,
-                    "reset_time": "00:00",
-                    "emergency_threshold": 1800,
-                    "circuit_breaker_threshold": 1900
+                    "capacity": 1900,
+                    "window_minutes": QUOTA_WINDOW_MINUTES,
+                    "buckets": [],
+                    "last_minute": None
                 }
             }
             
-            with open("config/quota_management.json", "w") as f:
-                import json
-                json.dump(quota_config, f, indent=2)
+            _write_file("config/quota_management.json", json.dumps(quota_config, indent=2))
+            
+            _write_file("quota_window.py", QUOTA_WINDOW_MODULE)
             
-            self.fixes_applied.append("Created quota management system")
+            self._record_fix("Created quota management system")
             
-            # Add quota checking to scheduler
+            # Add quota checking to scheduler: windows are loaded from
+            # quota_management.json once at startup and flushed back
+            # periodically, so checks never touch the file
             quota_check_code = '''
+from quota_window import QuotaWindow, start_ticker
+
+QUOTA_FILE = "config/quota_management.json"
+QUOTA_FLUSH_INTERVAL = 60  # seconds between bucket flushes to QUOTA_FILE
+
+# service -> QuotaWindow
+_quota_windows = {}
+
+
+def _load_quota_windows():
+    """Seed the sliding windows from QUOTA_FILE."""
+    with open(QUOTA_FILE, "r") as f:
+        quotas = json.load(f)
+    for service, config in quotas.items():
+        _quota_windows[service] = QuotaWindow(
+            config["capacity"], config["window_minutes"],
+            config.get("buckets"), config.get("last_minute"))
+
+
+def allow_request(service: str, cost: int = 1) -> bool:
+    """Record `cost` against `service` if its window has room; False otherwise."""
+    window = _quota_windows.get(service)
+    if window is None or window.acquire(cost):
+        return True
+    logger.warning(f"{service} quota exceeded, enabling circuit breaker")
+    return False
+
+
+def _flush_quota_windows():
+    """Write the buckets, and the minute they end at, back to QUOTA_FILE every QUOTA_FLUSH_INTERVAL seconds."""
+    while True:
+        time.sleep(QUOTA_FLUSH_INTERVAL)
+        try:
+            with open(QUOTA_FILE, "r") as f:
+                quotas = json.load(f)
+            for service, window in _quota_windows.items():
+                quotas[service]["buckets"], quotas[service]["last_minute"] = window.snapshot()
+            # Replace atomically so a reader never parses a partial file
+            tmp_path = f"{QUOTA_FILE}.tmp.{os.getpid()}"
+            with open(tmp_path, "w") as f:
+                json.dump(quotas, f)
+            os.replace(tmp_path, QUOTA_FILE)
+        except Exception as e:
+            logger.error(f"Quota flush failed: {e}")
+
+
 def check_api_quotas(self) -> Dict[str, bool]:
-    """Check API quota usage before making calls."""
-    try:
-        with open("config/quota_management.json", "r") as f:
-            quotas = json.load(f)
-        
-        for service, config in quotas.items():
-            if config["current_usage"] >= config["circuit_breaker_threshold"]:
-                logger.warning(f"{service} quota exceeded, enabling circuit breaker")
-                return {service: False}
-        
-        return {service: True for service in quotas.keys()}
-    except Exception as e:
-        logger.error(f"Quota check failed: {e}")
-        return {}
+    """Check API quota headroom before making calls."""
+    return {service: window.allow() for service, window in _quota_windows.items()}
+
+
+_load_quota_windows()
+start_ticker(_quota_windows.values())
+threading.Thread(target=_flush_quota_windows, name="quota-flush", daemon=True).start()
 '''
             
-            self.fixes_applied.append("Added quota checking to scheduler")
+            self._record_fix("Added quota checking to scheduler")
             return True
             
         except Exception as e:
-            self.errors.append(f"YouTube quota fix failed: {e}")
+            self._record_error(f"YouTube quota fix failed: {e}")
             return False
     
     def fix_systemd_service(self) -> bool:
@@ -99,49 +411,52 @@ def check_api_quotas(self) -> Dict[str, bool]:
         
         try:
             # Create proper systemd service file
-            service_content = f"""[Unit]
-Description=RetailXAI Data Collection and Processing System
-After=network.target postgresql.service
-Wants=postgresql.service
-
-[Service]
-Type=simple
-User=retailxai
-Group=retailxai
-WorkingDirectory={os.getcwd()}
-Environment=PYTHONPATH={os.getcwd()}
-ExecStart={os.getcwd()}/venv/bin/python main.py
-ExecReload=/bin/kill -HUP $MAINPID
-Restart=always
-RestartSec=10
-StandardOutput=journal
-StandardError=journal
-SyslogIdentifier=retailxai
-
-# Resource limits
-LimitNOFILE=65536
-LimitNPROC=32768
-
-# Security settings
-NoNewPrivileges=true
-PrivateTmp=true
-ProtectSystem=strict
-ProtectHome=true
-ReadWritePaths={os.getcwd()}/logs
-ReadWritePaths={os.getcwd()}/config
-
-[Install]
-WantedBy=multi-user.target
-"""
+            cwd = os.getcwd()
+            service_content = textwrap.dedent(f"""\
+            [Unit]
+            Description=RetailXAI Data Collection and Processing System
+            After=network.target postgresql.service
+            Wants=postgresql.service
+
+            [Service]
+            Type=notify
+            NotifyAccess=main
+            WatchdogSec=30
+            User=retailxai
+            Group=retailxai
+            WorkingDirectory={cwd}
+            Environment=PYTHONPATH={cwd}
+            ExecStart={cwd}/venv/bin/python main.py
+            ExecReload=/bin/kill -HUP $MAINPID
+            Restart=always
+            RestartSec=10
+            StandardOutput=journal
+            StandardError=journal
+            SyslogIdentifier=retailxai
+
+            # Resource limits
+            LimitNOFILE=65536
+            LimitNPROC=32768
+
+            # Security settings
+            NoNewPrivileges=true
+            PrivateTmp=true
+            ProtectSystem=strict
+            ProtectHome=true
+            ReadWritePaths={cwd}/logs
+            ReadWritePaths={cwd}/config
+
+            [Install]
+            WantedBy=multi-user.target
+            """)
             
-            with open("retailxai.service", "w") as f:
-                f.write(service_content)
+            _write_file("retailxai.service", service_content)
             
-            self.fixes_applied.append("Created proper systemd service file")
+            self._record_fix("Created proper systemd service file")
             return True
             
         except Exception as e:
-            self.errors.append(f"Systemd service fix failed: {e}")
+            self._record_error(f"Systemd service fix failed: {e}")
             return False
     
     def setup_production_monitoring(self) -> bool:
@@ -180,15 +495,16 @@ WantedBy=multi-user.target
                 }
             }
             
-            with open("config/monitoring.yaml", "w") as f:
-                import yaml
-                yaml.dump(monitoring_config, f, default_flow_style=False)
+            # libyaml's C emitter when PyYAML was built with it
+            dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+            data = yaml.dump(monitoring_config, Dumper=dumper, default_flow_style=False)
+            _write_file("config/monitoring.yaml", data)
             
-            self.fixes_applied.append("Created monitoring configuration")
+            self._record_fix("Created monitoring configuration")
             return True
             
         except Exception as e:
-            self.errors.append(f"Monitoring setup failed: {e}")
+            self._record_error(f"Monitoring setup failed: {e}")
             return False
     
     def setup_health_endpoints(self) -> bool:
@@ -198,59 +514,164 @@ WantedBy=multi-user.target
         try:
             # Create enhanced health endpoint
             health_endpoint_code = '''
+import threading
+import time
+
+import orjson
+from flask import Response
+
+from circuit_breaker import CircuitBreakerConfig, CircuitBreakerOpenException, get_circuit_breaker
+
+# Probes of external subsystems go through a breaker each; while one is open
+# its last known result is served (as DEGRADED) instead of re-probing
+_HEALTH_BREAKER_CONFIG = CircuitBreakerConfig(
+    failure_threshold=3,
+    success_threshold=2,
+    recovery_timeout=60,
+    timeout=10,
+    backoff_factor=2.0
+)
+_GUARDED_PROBES = {
+    'database': '_check_database_health',
+    'api': '_check_api_health',
+    'quotas': '_check_api_quotas'
+}
+_last_probe_results = {}
+
+
+class _UnhealthyProbe(Exception):
+    """A probe returned a non-HEALTHY result; counts as a breaker failure."""
+
+    def __init__(self, result):
+        super().__init__(result.get('error', result.get('status')))
+        self.result = result
+
+
+def _guard_probe(component, probe):
+    """Wrap a ProductionMonitor probe in its component's circuit breaker."""
+    breaker = get_circuit_breaker(f"health.{component}", _HEALTH_BREAKER_CONFIG)
+    
+    def run():
+        result = probe()
+        _last_probe_results[component] = result
+        if result.get('status') != 'HEALTHY':
+            raise _UnhealthyProbe(result)
+        return result
+    
+    def guarded():
+        try:
+            return breaker.call(run)
+        except CircuitBreakerOpenException:
+            return dict(_last_probe_results.get(component, {}), status='DEGRADED', circuit='open')
+        except _UnhealthyProbe as e:
+            return e.result
+        except Exception as e:
+            return {'status': 'UNHEALTHY', 'error': str(e)}
+    
+    return guarded
+
+
+def _guard_monitor(monitor):
+    """Route a monitor's external probes through their circuit breakers."""
+    for component, method in _GUARDED_PROBES.items():
+        setattr(monitor, method, _guard_probe(component, getattr(monitor, method)))
+    return monitor
+
+# One monitor sampled in the background; the endpoints serve its latest
+# dashboard so scrapes never wait on (or multiply) the probes
+HEALTH_SAMPLE_INTERVAL = 30  # seconds
+_health_snapshot = {}
+_health_sampler_lock = threading.Lock()
+_health_sampler_started = False
+
+
+# Alerting config for the monitor, read from the environment once at import
+_HEALTH_MONITOR_CONFIG = {
+    'email': {
+        'smtp_server': os.getenv('ALERT_EMAIL_SMTP', 'smtp.gmail.com'),
+        'smtp_port': int(os.getenv('ALERT_EMAIL_PORT', '587')),
+        'username': os.getenv('ALERT_EMAIL_USER'),
+        'password': os.getenv('ALERT_EMAIL_PASS'),
+        'from': os.getenv('ALERT_EMAIL_FROM'),
+        'to': [os.getenv('ALERT_EMAIL_TO')]
+    },
+    'slack_webhook': os.getenv('SLACK_WEBHOOK_URL')
+}
+
+
+def _health_monitor():
+    """Build the shared, breaker-guarded production monitor."""
+    from production_monitor import ProductionMonitor
+    
+    return _guard_monitor(ProductionMonitor(_HEALTH_MONITOR_CONFIG))
+
+
+def _sample_health(monitor):
+    """Replace the snapshot with a fresh dashboard."""
+    global _health_snapshot
+    try:
+        _health_snapshot = monitor.get_production_dashboard()
+    except Exception as e:
+        _health_snapshot = {'error': str(e), 'last_updated': datetime.now()}
+
+
+def _health_sampler(monitor):
+    """Refresh the snapshot every HEALTH_SAMPLE_INTERVAL seconds."""
+    while True:
+        time.sleep(HEALTH_SAMPLE_INTERVAL)
+        _sample_health(monitor)
+
+
+def _ensure_health_sampler():
+    """Take the first sample and start the sampler thread, once per process."""
+    global _health_sampler_started
+    with _health_sampler_lock:
+        if _health_sampler_started:
+            return
+        monitor = _health_monitor()
+        _sample_health(monitor)
+        threading.Thread(target=_health_sampler, args=(monitor,), name="health-sampler", daemon=True).start()
+        _health_sampler_started = True
+
+def _json_response(data, status=200):
+    """JSON response encoded with orjson; datetimes are serialized natively."""
+    return Response(orjson.dumps(data), status=status, mimetype='application/json')
+
 @app.route('/api/health/detailed')
 def get_detailed_health():
     """Get detailed system health information."""
     try:
-        from production_monitor import ProductionMonitor
-        
-        config = {
-            'email': {
-                'smtp_server': os.getenv('ALERT_EMAIL_SMTP', 'smtp.gmail.com'),
-                'smtp_port': int(os.getenv('ALERT_EMAIL_PORT', '587')),
-                'username': os.getenv('ALERT_EMAIL_USER'),
-                'password': os.getenv('ALERT_EMAIL_PASS'),
-                'from': os.getenv('ALERT_EMAIL_FROM'),
-                'to': [os.getenv('ALERT_EMAIL_TO')]
-            },
-            'slack_webhook': os.getenv('SLACK_WEBHOOK_URL')
-        }
-        
-        monitor = ProductionMonitor(config)
-        dashboard = monitor.get_production_dashboard()
-        
-        return jsonify(dashboard)
+        _ensure_health_sampler()
+        if 'error' in _health_snapshot:
+            return _json_response(_health_snapshot, 500)
+        return _json_response(_health_snapshot)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/api/health/sla')
 def get_sla_metrics():
     """Get SLA metrics."""
     try:
-        from production_monitor import ProductionMonitor
+        _ensure_health_sampler()
+        dashboard = _health_snapshot
         
-        config = {}
-        monitor = ProductionMonitor(config)
-        health_status = monitor.check_system_health()
-        
-        return jsonify({
-            'sla_metrics': health_status.get('sla_metrics', {}),
-            'overall_status': health_status.get('overall_status', 'UNKNOWN'),
-            'timestamp': datetime.now().isoformat()
+        return _json_response({
+            'sla_metrics': dashboard.get('sla_metrics', {}),
+            'overall_status': dashboard.get('system_status', 'UNKNOWN'),
+            'timestamp': dashboard.get('last_updated', datetime.now())
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 '''
             
             # Append to staging_site.py
-            with open("staging_site.py", "a") as f:
-                f.write(health_endpoint_code)
+            _write_file("staging_site.py", health_endpoint_code, append=True)
             
-            self.fixes_applied.append("Added detailed health endpoints")
+            self._record_fix("Added detailed health endpoints")
             return True
             
         except Exception as e:
-            self.errors.append(f"Health endpoints setup failed: {e}")
+            self._record_error(f"Health endpoints setup failed: {e}")
             return False
     
     def setup_automated_deployment(self) -> bool:
@@ -315,14 +736,13 @@ jobs:
 '''
             
             os.makedirs(".github/workflows", exist_ok=True)
-            with open(".github/workflows/deploy.yml", "w") as f:
-                f.write(workflow_content)
+            _write_file(".github/workflows/deploy.yml", workflow_content)
             
-            self.fixes_applied.append("Created GitHub Actions deployment workflow")
+            self._record_fix("Created GitHub Actions deployment workflow")
             return True
             
         except Exception as e:
-            self.errors.append(f"Automated deployment setup failed: {e}")
+            self._record_error(f"Automated deployment setup failed: {e}")
             return False
     
     def create_production_scripts(self) -> bool:
@@ -361,47 +781,17 @@ echo "✅ Starting RetailXAI scheduler..."
 python3 main.py
 '''
             
-            with open("start_production.sh", "w") as f:
-                f.write(start_script)
-            os.chmod("start_production.sh", 0o755)
+            _write_file("start_production.sh", start_script, mode=EXECUTABLE_MODE)
             
-            # Create health check script
-            health_script = '''#!/bin/bash
-# Health check script for RetailXAI
-
-echo "🏥 Checking RetailXAI Health..."
-
-# Check if service is running
-if ! systemctl is-active --quiet retailxai; then
-    echo "❌ RetailXAI service is not running"
-    exit 1
-fi
-
-# Check API endpoints
-if ! curl -f -s http://localhost:5000/api/health > /dev/null; then
-    echo "❌ Health endpoint not responding"
-    exit 1
-fi
-
-# Check database connectivity
-if ! python3 -c "from database_manager import DatabaseManager; print('DB OK')" 2>/dev/null; then
-    echo "❌ Database connection failed"
-    exit 1
-fi
-
-echo "✅ All health checks passed"
-exit 0
-'''
-            
-            with open("health_check.sh", "w") as f:
-                f.write(health_script)
-            os.chmod("health_check.sh", 0o755)
+            # Create health check script (in-process checks on a reused
+            # HTTP session and database pool; --interval keeps it running)
+            _write_file("health_check.py", HEALTH_CHECK_SCRIPT, mode=EXECUTABLE_MODE)
             
-            self.fixes_applied.append("Created production management scripts")
+            self._record_fix("Created production management scripts")
             return True
             
         except Exception as e:
-            self.errors.append(f"Production scripts creation failed: {e}")
+            self._record_error(f"Production scripts creation failed: {e}")
             return False
     
     def run_all_fixes(self) -> bool:
@@ -418,12 +808,16 @@ exit 0
             self.create_production_scripts
         ]
         
+        # Each fix writes its own files (none share an output), so they can
+        # run side by side; their cost is almost entirely file-system calls
         success_count = 0
-        for fix in fixes:
-            if fix():
-                success_count += 1
-            else:
-                logger.error(f"Fix failed: {fix.__name__}")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {executor.submit(fix): fix for fix in fixes}
+            for future in as_completed(futures):
+                if future.result():
+                    success_count += 1
+                else:
+                    logger.error(f"Fix failed: {futures[future].__name__}")
         
         logger.info(f"✅ Applied {success_count}/{len(fixes)} fixes")
         
@@ -436,31 +830,38 @@ exit 0
     
     def print_summary(self) -> None:
         """Print fix summary."""
-        print("\n" + "="*60)
-        print("🚀 RETAILXAI PRODUCTION FIXES SUMMARY")
-        print("="*60)
+        # Assemble the report in memory and write it to stdout once
+        buf = io.StringIO()
+        out = functools.partial(print, file=buf)
         
-        print(f"\n✅ FIXES APPLIED ({len(self.fixes_applied)}):")
+        out("\n" + "="*60)
+        out("🚀 RETAILXAI PRODUCTION FIXES SUMMARY")
+        out("="*60)
+        
+        out(f"\n✅ FIXES APPLIED ({len(self.fixes_applied)}):")
         for i, fix in enumerate(self.fixes_applied, 1):
-            print(f"  {i}. {fix}")
+            out(f"  {i}. {fix}")
         
         if self.errors:
-            print(f"\n❌ ERRORS ({len(self.errors)}):")
+            out(f"\n❌ ERRORS ({len(self.errors)}):")
             for i, error in enumerate(self.errors, 1):
-                print(f"  {i}. {error}")
+                out(f"  {i}. {error}")
         
-        print("\n📋 NEXT STEPS:")
-        print("  1. Deploy fixes to production server")
-        print("  2. Restart systemd service: sudo systemctl restart retailxai")
-        print("  3. Verify health endpoints: curl http://localhost:5000/api/health")
-        print("  4. Set up monitoring alerts")
-        print("  5. Configure GitHub Actions secrets")
+        out("\n📋 NEXT STEPS:")
+        out("  1. Deploy fixes to production server")
+        out("  2. Restart systemd service: sudo systemctl restart retailxai")
+        out("  3. Verify health endpoints: curl http://localhost:5000/api/health")
+        out("  4. Set up monitoring alerts")
+        out("  5. Configure GitHub Actions secrets")
         
-        print("\n🎯 ELON'S VERDICT:")
+        out("\n🎯 ELON'S VERDICT:")
         if len(self.errors) == 0:
-            print("  'Now THIS is production-ready! Well done.'")
+            out("  'Now THIS is production-ready! Well done.'")
         else:
-            print("  'Still needs work, but getting there. Fix those errors!'")
+            out("  'Still needs work, but getting there. Fix those errors!'")
+        
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
 
 def main():
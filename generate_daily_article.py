@@ -14,15 +14,16 @@ sys.path.append('/home/retailxai/precipice')
 
 from simple_article_generator import SimpleArticleGenerator
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/home/retailxai/precipice/logs/article_generator.log'),
-        logging.StreamHandler()
-    ]
-)
+# Set up logging; the log file is only opened once something is logged to it
+LOG_FORMAT = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', validate=False)
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+for handler in (
+    logging.FileHandler('/home/retailxai/precipice/logs/article_generator.log', delay=True),
+    logging.StreamHandler()
+):
+    handler.setFormatter(LOG_FORMAT)
+    root_logger.addHandler(handler)
 
 logger = logging.getLogger("RetailXAI.ArticleGenerator")
 
@@ -31,11 +32,14 @@ def generate_daily_article():
     try:
         logger.info("Starting daily article generation")
         
-        # Create article generator
+        # Create article generator; its template data is loaded once and
+        # shared by the daily article and the Monday weekly summary
         generator = SimpleArticleGenerator()
         
-        # Generate article with current date
-        current_date = datetime.now().strftime('%B %Y')
+        # One clock reading for the whole run, so the title and the Monday
+        # check agree even if the run crosses midnight
+        now = datetime.now()
+        current_date = now.strftime('%B %Y')
         title = f"Retail Market Analysis - {current_date}"
         
         filepath = generator.generate_article(title)
@@ -43,7 +47,7 @@ def generate_daily_article():
         logger.info(f"Daily article generated successfully: {filepath}")
         
         # Also generate a weekly summary if it's Monday
-        if datetime.now().weekday() == 0:  # Monday
+        if now.weekday() == 0:  # Monday
             weekly_title = f"Weekly Retail Roundup - {current_date}"
             weekly_filepath = generator.generate_article(weekly_title)
             logger.info(f"Weekly summary generated: {weekly_filepath}")
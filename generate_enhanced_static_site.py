@@ -5,187 +5,349 @@ Generates static site for GitHub Pages with new data sources.
 """
 
 import os
+import re
 import sys
-import json
-import requests
+import signal
+import argparse
+import html
+import orjson
+import gzip
+import hashlib
+import asyncio
+import aiohttp
 from datetime import datetime
 import logging
+from string import Template
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+# Optional imports with graceful fallbacks
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def fetch_data_from_server():
-    """Fetch data from production server."""
-    base_url = "http://143.198.14.56:5000"
-    
-    data = {
-        'transcripts': [],
-        'analyses': [],
-        'articles': [],
-        'companies': [],
-        'stats': {},
-        'health': {}
-    }
-    
+# Production API the site is built from; override to build against staging
+PRODUCTION_SERVER = os.getenv('PRODUCTION_SERVER', "http://143.198.14.56:5000")
+
+# Items shown per list; the API is asked for no more than this
+ITEMS_SHOWN = 10
+
+# API endpoints mirrored into the site as (name, path under /api/, factory
+# for the value used when one fails)
+ENDPOINTS = (
+    ('transcripts', f'transcripts?limit={ITEMS_SHOWN}', list),
+    ('analyses', f'analyses?limit={ITEMS_SHOWN}', list),
+    ('articles', f'articles?limit={ITEMS_SHOWN}', list),
+    ('companies', 'companies', list),
+    ('stats', 'stats', dict),
+    ('health', 'health', dict),
+    ('analysis_summary', 'analyses/summary', dict)
+)
+
+# Page skeleton, parsed once at import and split around its item lists, so
+# iter_html only substitutes values and streams the items in between
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+TEMPLATE_FILE = os.path.join(TEMPLATES_DIR, 'static_site.tmpl')
+with open(TEMPLATE_FILE, encoding='utf-8') as _f:
+    _segments = re.split(r'\$(transcript_list|article_list|analysis_list)\b', _f.read())
+_PAGE_SEGMENTS = [Template(segment) for segment in _segments[::2]]
+_PAGE_LISTS = _segments[1::2]
+
+# The stylesheet is static, so it is read once and dropped in as a value
+# rather than scanned for placeholders on every render
+with open(os.path.join(TEMPLATES_DIR, 'static_site.css'), encoding='utf-8') as _f:
+    _CSS = _f.read().rstrip('\n')
+
+# Endpoint bodies and ETags from the previous run, plus the hash of the data
+# the current docs/index.html was rendered from
+CACHE_DIR = '.cache'
+LAST_HASH_FILE = os.path.join(CACHE_DIR, 'last_hash')
+
+def _cache_get(name: str) -> Tuple[Optional[str], Optional[bytes]]:
+    """Return the cached (etag, body) for an endpoint, or (None, None)."""
     try:
-        # Fetch transcripts
-        response = requests.get(f"{base_url}/api/transcripts", timeout=30)
-        if response.status_code == 200:
-            data['transcripts'] = response.json()
-        else:
-            logger.warning(f"Failed to fetch transcripts: {response.status_code}")
-    except Exception as e:
-        logger.warning(f"Error fetching transcripts: {e}")
-    
+        with open(os.path.join(CACHE_DIR, f"{name}.etag"), encoding='utf-8') as f:
+            etag = f.read()
+        with open(os.path.join(CACHE_DIR, f"{name}.json"), 'rb') as f:
+            body = f.read()
+    except OSError:
+        return None, None
+    return etag, body
+
+def _cache_put(name: str, etag: str, body: bytes) -> None:
+    """Store an endpoint's body and ETag for the next run."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, f"{name}.json"), 'wb') as f:
+        f.write(body)
+    with open(os.path.join(CACHE_DIR, f"{name}.etag"), 'w', encoding='utf-8') as f:
+        f.write(etag)
+
+async def _fetch(session, base_url, name, path):
+    """Fetch one API endpoint; returns (name, payload or None).
+
+    A cached ETag is sent as If-None-Match, so unchanged data comes back as a
+    bodyless 304 and is read from the cache instead.
+    """
+    etag, cached = _cache_get(name)
+    headers = {'If-None-Match': etag} if etag else {}
+    async with session.get(f"{base_url}/api/{path}", headers=headers) as response:
+        if response.status == 304 and cached is not None:
+            return name, orjson.loads(cached)
+        if response.status == 200:
+            body = await response.read()
+            new_etag = response.headers.get('ETag')
+            if new_etag:
+                _cache_put(name, new_etag, body)
+            return name, orjson.loads(body)
+        logger.warning(f"Failed to fetch {name}: {response.status}")
+        return name, None
+
+def _client_session():
+    """HTTP session for the production API."""
+    timeout = aiohttp.ClientTimeout(total=30, connect=5)
+    # Every request goes to one host; cap it at one connection per endpoint
+    connector = aiohttp.TCPConnector(limit_per_host=len(ENDPOINTS))
+    return aiohttp.ClientSession(timeout=timeout, connector=connector)
+
+async def _fetch_all(session, base_url):
+    """Fetch every endpoint's payload, in ENDPOINTS order.
+
+    One /api/dashboard request covers all of them; servers without that
+    endpoint are asked for each one concurrently over the same session.
+    """
     try:
-        # Fetch analyses
-        response = requests.get(f"{base_url}/api/analyses", timeout=30)
-        if response.status_code == 200:
-            data['analyses'] = response.json()
-        else:
-            logger.warning(f"Failed to fetch analyses: {response.status_code}")
+        _, dashboard = await _fetch(session, base_url, 'dashboard', f'dashboard?limit={ITEMS_SHOWN}')
     except Exception as e:
-        logger.warning(f"Error fetching analyses: {e}")
+        logger.warning(f"Error fetching dashboard: {e}")
+        dashboard = None
     
-    try:
-        # Fetch articles
-        response = requests.get(f"{base_url}/api/articles", timeout=30)
-        if response.status_code == 200:
-            data['articles'] = response.json()
-        else:
-            logger.warning(f"Failed to fetch articles: {response.status_code}")
-    except Exception as e:
-        logger.warning(f"Error fetching articles: {e}")
+    if dashboard:
+        return [(name, dashboard.get(name)) for name, _, _ in ENDPOINTS]
     
-    try:
-        # Fetch companies
-        response = requests.get(f"{base_url}/api/companies", timeout=30)
-        if response.status_code == 200:
-            data['companies'] = response.json()
-        else:
-            logger.warning(f"Failed to fetch companies: {response.status_code}")
-    except Exception as e:
-        logger.warning(f"Error fetching companies: {e}")
+    return await asyncio.gather(
+        *(_fetch(session, base_url, name, path) for name, path, _ in ENDPOINTS),
+        return_exceptions=True
+    )
+
+async def _fetch_data(session) -> Dict[str, Any]:
+    """Fetch data from production server over an open session."""
+    data = {name: default() for name, _, default in ENDPOINTS}
     
-    try:
-        # Fetch stats
-        response = requests.get(f"{base_url}/api/stats", timeout=30)
-        if response.status_code == 200:
-            data['stats'] = response.json()
-        else:
-            logger.warning(f"Failed to fetch stats: {response.status_code}")
-    except Exception as e:
-        logger.warning(f"Error fetching stats: {e}")
-    
-    try:
-        # Fetch health
-        response = requests.get(f"{base_url}/api/health", timeout=30)
-        if response.status_code == 200:
-            data['health'] = response.json()
-        else:
-            logger.warning(f"Failed to fetch health: {response.status_code}")
-    except Exception as e:
-        logger.warning(f"Error fetching health: {e}")
+    for (name, _, _), result in zip(ENDPOINTS, await _fetch_all(session, PRODUCTION_SERVER)):
+        if isinstance(result, Exception):
+            logger.warning(f"Error fetching {name}: {result}")
+        elif result[1] is not None:
+            data[name] = result[1]
     
     return data
 
-def generate_html(data):
-    """Generate HTML content."""
-    stats = data.get('stats', {})
-    transcripts = data.get('transcripts', [])
-    analyses = data.get('analyses', [])
-    articles = data.get('articles', [])
-    companies = data.get('companies', [])
-    health = data.get('health', {})
-    
-    # Generate company list
-    company_list = ""
-    for company in companies:
-        company_list += f"<li>{company.get('name', 'Unknown')}</li>"
+def fetch_data_from_server() -> Dict[str, Any]:
+    """Fetch data from production server."""
+    async def fetch():
+        async with _client_session() as session:
+            return await _fetch_data(session)
     
-    # Generate recent transcripts
-    transcript_list = ""
-    for transcript in transcripts[:10]:  # Show last 10
-        title = transcript.get('title', 'Untitled')
-        company = transcript.get('company_name', 'Unknown Company')
-        published = transcript.get('published_at', 'Unknown Date')
-        content = transcript.get('content', 'No content available')[:200] + "..."
-        
-        transcript_list += f"""
+    return asyncio.run(fetch())
+
+# Item fragments, parsed once; the loops fill them with format_map
+_TRANSCRIPT_TMPL = """
         <div class="item">
             <div class="item-title">{title}</div>
             <div class="item-meta">{company} • {published}</div>
             <div class="item-content">{content}</div>
         </div>
         """
-    
-    # Generate recent analyses
-    analysis_list = ""
-    for analysis in analyses[:10]:  # Show last 10
-        title = analysis.get('transcript_title', 'Analysis')
-        company = analysis.get('company_name', 'Unknown Company')
-        sentiment = analysis.get('metrics', {}).get('sentiment', 'N/A')
-        confidence = analysis.get('metrics', {}).get('confidence', 'N/A')
-        strategy = analysis.get('strategy', {})
-        trends = analysis.get('trends', {})
-        consumer_insights = analysis.get('consumer_insights', {})
-        tech_observations = analysis.get('tech_observations', {})
-        operations = analysis.get('operations', {})
-        outlook = analysis.get('outlook', {})
-        
-        # Format sentiment with color coding
-        sentiment_color = "#27ae60" if isinstance(sentiment, (int, float)) and sentiment > 0 else "#e74c3c" if isinstance(sentiment, (int, float)) and sentiment < 0 else "#f39c12"
-        sentiment_display = f"{sentiment:.2f}" if isinstance(sentiment, (int, float)) else str(sentiment)
-        
-        # Format outlook with emoji
-        outlook_emoji = "📈" if outlook.get('forecast') == 'bullish' else "📉" if outlook.get('forecast') == 'bearish' else "➡️"
-        
-        analysis_list += f"""
+
+_ANALYSIS_TMPL = """
         <div class="item">
             <div class="item-title">{title}</div>
-            <div class="item-meta">{company} • Analysis ID: {analysis.get('id', 'N/A')}</div>
+            <div class="item-meta">{company} • Analysis ID: {id}</div>
             <div class="item-content">
                 <div style="margin-bottom: 10px;">
                     <strong>Sentiment:</strong> <span style="color: {sentiment_color}; font-weight: bold;">{sentiment_display}</span> 
                     (Confidence: {confidence})
                 </div>
                 <div style="margin-bottom: 8px;">
-                    <strong>Strategy:</strong> {', '.join([f"{k}: {v}" for k, v in strategy.items()]) if strategy else 'N/A'}
+                    <strong>Strategy:</strong> {strategy}
                 </div>
                 <div style="margin-bottom: 8px;">
-                    <strong>Trends:</strong> {', '.join([f"{k}: {v}" for k, v in trends.items()]) if trends else 'N/A'}
+                    <strong>Trends:</strong> {trends}
                 </div>
                 <div style="margin-bottom: 8px;">
-                    <strong>Consumer Insights:</strong> {', '.join([f"{k}: {v}" for k, v in consumer_insights.items()]) if consumer_insights else 'N/A'}
+                    <strong>Consumer Insights:</strong> {consumer_insights}
                 </div>
                 <div style="margin-bottom: 8px;">
-                    <strong>Tech Observations:</strong> {', '.join([f"{k}: {v}" for k, v in tech_observations.items()]) if tech_observations else 'N/A'}
+                    <strong>Tech Observations:</strong> {tech_observations}
                 </div>
                 <div style="margin-bottom: 8px;">
-                    <strong>Operations:</strong> {', '.join([f"{k}: {v}" for k, v in operations.items()]) if operations else 'N/A'}
+                    <strong>Operations:</strong> {operations}
                 </div>
                 <div>
-                    <strong>Outlook:</strong> {outlook_emoji} {', '.join([f"{k}: {v}" for k, v in outlook.items()]) if outlook else 'N/A'}
+                    <strong>Outlook:</strong> {outlook_emoji} {outlook}
                 </div>
             </div>
         </div>
         """
-    
-    # Generate recent articles
-    article_list = ""
-    for article in articles[:10]:  # Show last 10
-        title = article.get('title', 'Untitled')
-        published = article.get('published_at', 'Unknown Date')
-        content = article.get('content', 'No content available')[:200] + "..."
-        
-        article_list += f"""
+
+_ARTICLE_TMPL = """
         <div class="item">
             <div class="item-title">{title}</div>
             <div class="item-meta">{published}</div>
             <div class="item-content">{content}</div>
         </div>
         """
+
+# Shown above the distributions when they were counted client-side
+_SAMPLE_NOTE_TMPL = """
+                    <div class="item">
+                        <div class="item-meta">Sample: counted over the {count} most recent analyses; totals unavailable</div>
+                    </div>"""
+
+def _preview(text: str, n: int = 200, default: str = 'No content available') -> str:
+    """Return the first n characters of text, with an ellipsis only if it was cut."""
+    if not text:
+        return default
+    return text[:n] + '…' if len(text) > n else text
+
+def _column(rows: List[Dict[str, Any]], key: str, default: str, limit: Optional[int] = None) -> List[str]:
+    """Pull one field out of every API record as a list of HTML-escaped strings."""
+    if limit is not None:
+        values = [_preview(str(row.get(key) or ''), limit, default) for row in rows]
+    else:
+        values = [str(row.get(key, default)) for row in rows]
+    return list(map(html.escape, values))
+
+# Analysis fields holding JSON objects; some servers send them still encoded
+_ANALYSIS_SECTIONS = ('metrics', 'strategy', 'trends', 'consumer_insights',
+                      'tech_observations', 'operations', 'outlook')
+
+def _decode_sections(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the analysis with any JSON-string sections decoded to dicts.
+
+    Sections that are already objects are passed through untouched; a string
+    that is not a JSON object is kept as the section's summary text.
+    """
+    if not any(isinstance(analysis.get(key), str) for key in _ANALYSIS_SECTIONS):
+        return analysis
+    decoded = dict(analysis)
+    for key in _ANALYSIS_SECTIONS:
+        value = decoded.get(key)
+        if not isinstance(value, str):
+            continue
+        try:
+            parsed = orjson.loads(value)
+        except orjson.JSONDecodeError:
+            parsed = None
+        decoded[key] = parsed if isinstance(parsed, dict) else {'summary': value}
+    return decoded
+
+def _pairs(mapping: Mapping[str, Any]) -> str:
+    """Render an analysis section as escaped 'key: value' pairs."""
+    if not mapping:
+        return 'N/A'
+    return html.escape(', '.join([f"{k}: {v}" for k, v in mapping.items()]))
+
+def iter_html(data: Dict[str, Any]) -> Iterator[str]:
+    """Generate HTML content as a stream of chunks."""
+    stats = data.get('stats', {})
+    transcripts = data.get('transcripts', [])
+    analyses = [_decode_sections(analysis) for analysis in data.get('analyses', [])]
+    articles = data.get('articles', [])
+    health = data.get('health', {})
+    
+    # Generate recent transcripts; API fields are escaped a column at a time
+    recent = transcripts[:ITEMS_SHOWN]
+    columns = zip(
+        _column(recent, 'title', 'Untitled'),
+        _column(recent, 'company_name', 'Unknown Company'),
+        _column(recent, 'published_at', 'Unknown Date'),
+        _column(recent, 'content', 'No content available', limit=200)
+    )
+    transcript_parts = []
+    for title, company, published, content in columns:
+        transcript_parts.append(_TRANSCRIPT_TMPL.format_map({
+            'title': title,
+            'company': company,
+            'published': published,
+            'content': content
+        }))
+    
+    # Generate recent analyses
+    analysis_parts = []
+    for analysis in analyses[:ITEMS_SHOWN]:
+        title = html.escape(str(analysis.get('transcript_title', 'Analysis')))
+        company = html.escape(str(analysis.get('company_name', 'Unknown Company')))
+        metrics, strategy, trends, consumer_insights, tech_observations, operations, outlook = (
+            analysis.get(key, {}) for key in _ANALYSIS_SECTIONS
+        )
+        sentiment = metrics.get('sentiment', 'N/A')
+        confidence = html.escape(str(metrics.get('confidence', 'N/A')))
+        
+        # Format sentiment with color coding
+        numeric = isinstance(sentiment, (int, float))
+        sentiment_color = "#27ae60" if numeric and sentiment > 0 else "#e74c3c" if numeric and sentiment < 0 else "#f39c12"
+        sentiment_display = f"{sentiment:.2f}" if numeric else html.escape(str(sentiment))
+        
+        # Format outlook with emoji
+        outlook_emoji = "📈" if outlook.get('forecast') == 'bullish' else "📉" if outlook.get('forecast') == 'bearish' else "➡️"
+        
+        analysis_parts.append(_ANALYSIS_TMPL.format_map({
+            'title': title,
+            'company': company,
+            'id': html.escape(str(analysis.get('id', 'N/A'))),
+            'sentiment_color': sentiment_color,
+            'sentiment_display': sentiment_display,
+            'confidence': confidence,
+            'strategy': _pairs(strategy),
+            'trends': _pairs(trends),
+            'consumer_insights': _pairs(consumer_insights),
+            'tech_observations': _pairs(tech_observations),
+            'operations': _pairs(operations),
+            'outlook_emoji': outlook_emoji,
+            'outlook': _pairs(outlook)
+        }))
+    
+    # Generate recent articles
+    recent = articles[:ITEMS_SHOWN]
+    columns = zip(
+        _column(recent, 'title', 'Untitled'),
+        _column(recent, 'published_at', 'Unknown Date'),
+        _column(recent, 'content', 'No content available', limit=200)
+    )
+    article_parts = []
+    for title, published, content in columns:
+        article_parts.append(_ARTICLE_TMPL.format_map({
+            'title': title,
+            'published': published,
+            'content': content
+        }))
+    
+    # Sentiment and outlook distributions: the server's totals over every
+    # analysis when it sends them, otherwise counted here in one pass over
+    # the analyses fetched and labelled as a sample
+    summary = data.get('analysis_summary')
+    if summary:
+        positive, neutral, negative, bullish, bearish = (
+            summary.get(key, 0) for key in ('positive', 'neutral', 'negative', 'bullish', 'bearish')
+        )
+        distribution_note = ''
+    else:
+        distribution_note = _SAMPLE_NOTE_TMPL.format_map({'count': len(analyses)})
+        positive = neutral = negative = bullish = bearish = 0
+        for analysis in analyses:
+            sentiment = analysis.get('metrics', {}).get('sentiment')
+            if isinstance(sentiment, (int, float)):
+                positive += sentiment > 0
+                neutral += sentiment == 0
+                negative += sentiment < 0
+            forecast = analysis.get('outlook', {}).get('forecast')
+            bullish += forecast == 'bullish'
+            bearish += forecast == 'bearish'
     
     # Health status - determine from health checks
     health_checks = health.get('health_checks', [])
@@ -198,323 +360,138 @@ def generate_html(data):
     health_class = 'status-healthy' if is_healthy else 'status-unhealthy'
     health_text = 'Healthy' if is_healthy else 'Unhealthy'
     
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RetailXAI Enhanced Dashboard</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            color: #333;
-        }}
-
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-
-        .header {{
-            text-align: center;
-            margin-bottom: 40px;
-            color: white;
-        }}
-
-        .header h1 {{
-            font-size: 3rem;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-
-        .header p {{
-            font-size: 1.2rem;
-            opacity: 0.9;
-        }}
-
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 40px;
-        }}
-
-        .stat-card {{
-            background: white;
-            padding: 30px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            text-align: center;
-            transition: transform 0.3s ease;
-        }}
-
-        .stat-card:hover {{
-            transform: translateY(-5px);
-        }}
-
-        .stat-number {{
-            font-size: 2.5rem;
-            font-weight: bold;
-            color: #667eea;
-            margin-bottom: 10px;
-        }}
-
-        .stat-label {{
-            font-size: 1.1rem;
-            color: #666;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-
-        .content-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 30px;
-            margin-bottom: 40px;
-        }}
-
-        .content-card {{
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }}
-
-        .card-header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            font-size: 1.3rem;
-            font-weight: bold;
-        }}
-
-        .card-content {{
-            padding: 20px;
-            max-height: 400px;
-            overflow-y: auto;
-        }}
-
-        .item {{
-            padding: 15px;
-            border-bottom: 1px solid #eee;
-            transition: background-color 0.3s ease;
-        }}
-
-        .item:hover {{
-            background-color: #f8f9fa;
-        }}
-
-        .item:last-child {{
-            border-bottom: none;
-        }}
-
-        .item-title {{
-            font-weight: bold;
-            color: #333;
-            margin-bottom: 5px;
-        }}
-
-        .item-meta {{
-            font-size: 0.9rem;
-            color: #666;
-            margin-bottom: 8px;
-        }}
-
-        .item-content {{
-            font-size: 0.95rem;
-            color: #555;
-            line-height: 1.4;
-        }}
-
-        .status-indicator {{
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 8px;
-        }}
-
-        .status-healthy {{
-            background-color: #27ae60;
-        }}
-
-        .status-unhealthy {{
-            background-color: #e74c3c;
-        }}
-
-        .last-updated {{
-            text-align: center;
-            color: white;
-            margin-top: 40px;
-            opacity: 0.8;
-        }}
-
-        @media (max-width: 768px) {{
-            .content-grid {{
-                grid-template-columns: 1fr;
-            }}
-            
-            .header h1 {{
-                font-size: 2rem;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🚀 RetailXAI Enhanced Dashboard</h1>
-            <p>Advanced Retail Intelligence with 7 New Data Sources</p>
-        </div>
-
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-number">{stats.get('companies', 0)}</div>
-                <div class="stat-label">Companies</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{stats.get('transcripts', 0)}</div>
-                <div class="stat-label">Transcripts</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{stats.get('analyses', 0)}</div>
-                <div class="stat-label">Analyses</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{stats.get('articles', 0)}</div>
-                <div class="stat-label">Articles</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{stats.get('recent_transcripts', 0)}</div>
-                <div class="stat-label">Recent (7d)</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{stats.get('recent_analyses', 0)}</div>
-                <div class="stat-label">Recent (7d)</div>
-            </div>
-        </div>
-
-        <div class="content-grid">
-            <div class="content-card">
-                <div class="card-header">📊 Recent Transcripts</div>
-                <div class="card-content">
-                    {transcript_list if transcript_list else '<div class="item">No transcripts available</div>'}
-                </div>
-            </div>
-
-            <div class="content-card">
-                <div class="card-header">📰 Recent Articles</div>
-                <div class="card-content">
-                    {article_list if article_list else '<div class="item">No articles available</div>'}
-                </div>
-            </div>
-        </div>
-
-        <div class="content-card" style="margin-bottom: 40px;">
-            <div class="card-header">🤖 AI Analysis Results</div>
-            <div class="card-content" style="max-height: 600px;">
-                {analysis_list if analysis_list else '<div class="item">No analyses available</div>'}
-            </div>
-        </div>
-
-        <div class="content-grid">
-            <div class="content-card">
-                <div class="card-header">🏥 System Health</div>
-                <div class="card-content">
-                    <div class="item">
-                        <div class="item-title">
-                            <span class="status-indicator {health_class}"></span>
-                            System Status: {health_text}
-                        </div>
-                        <div class="item-meta">Database: {'Connected' if database_connected else 'Disconnected'}</div>
-                        <div class="item-content">
-                            Last Updated: {health.get('timestamp', 'Unknown')}
-                        </div>
-                    </div>
-                </div>
-            </div>
+    lists = {
+        'transcript_list': transcript_parts or ['<div class="item">No transcripts available</div>'],
+        'article_list': article_parts or ['<div class="item">No articles available</div>'],
+        'analysis_list': analysis_parts or ['<div class="item">No analyses available</div>']
+    }
+    values = dict(
+        css=_CSS,
+        companies=stats.get('companies', 0),
+        transcripts=stats.get('transcripts', 0),
+        analyses=stats.get('analyses', 0),
+        articles=stats.get('articles', 0),
+        recent_transcripts=stats.get('recent_transcripts', 0),
+        recent_analyses=stats.get('recent_analyses', 0),
+        health_class=health_class,
+        health_text=health_text,
+        database_status='Connected' if database_connected else 'Disconnected',
+        health_timestamp=health.get('timestamp', 'Unknown'),
+        positive=positive,
+        neutral=neutral,
+        negative=negative,
+        bullish=bullish,
+        bearish=bearish,
+        distribution_note=distribution_note,
+        last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+    )
+    
+    yield "\n"
+    yield _PAGE_SEGMENTS[0].substitute(values)
+    for list_name, segment in zip(_PAGE_LISTS, _PAGE_SEGMENTS[1:]):
+        yield from lists[list_name]
+        yield segment.substitute(values)
+
+def _fingerprint(data: Dict[str, Any]) -> str:
+    """Hash the fetched data, ignoring the health and stats timestamps.
+
+    Both endpoints stamp every response, so including the stamps would make
+    every run look like a change.
+    """
+    health = {k: v for k, v in data.get('health', {}).items() if k != 'timestamp'}
+    stats = {k: v for k, v in data.get('stats', {}).items() if k != 'last_updated'}
+    payload = orjson.dumps({**data, 'health': health, 'stats': stats}, default=str, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def regenerate(data: Dict[str, Any]) -> None:
+    """Write the site for freshly fetched data, unless it is unchanged."""
+    # Skip rendering when the page on disk was built from identical data
+    output_file = 'docs/index.html'
+    digest = _fingerprint(data)
+    try:
+        with open(LAST_HASH_FILE, encoding='utf-8') as f:
+            unchanged = f.read() == digest and os.path.exists(output_file)
+    except OSError:
+        unchanged = False
+    
+    if unchanged:
+        logger.info(f"✅ Data unchanged, keeping {output_file}")
+    else:
+        # Generate HTML, writing it a chunk at a time to a temporary file
+        # that replaces the page only once complete, so an interrupted run
+        # never leaves a half-written page behind
+        logger.info("🎨 Generating HTML...")
+        tmp_file = output_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(iter_html(data))
+        os.replace(tmp_file, output_file)
+        
+        # Precompressed copy for servers that serve .gz alongside the page;
+        # build-time compression is one-off, so use the highest level
+        with open(output_file, 'rb') as f:
+            compressed = gzip.compress(f.read(), compresslevel=9)
+        with open(tmp_file, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_file, output_file + '.gz')
+        
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(LAST_HASH_FILE, 'w', encoding='utf-8') as f:
+            f.write(digest)
+        
+        logger.info(f"✅ Static site generated: {output_file}")
+    
+    # Print summary
+    stats = data.get('stats', {})
+    logger.info(f"📊 Data Summary:")
+    logger.info(f"   Companies: {stats.get('companies', 0)}")
+    logger.info(f"   Transcripts: {stats.get('transcripts', 0)}")
+    logger.info(f"   Analyses: {stats.get('analyses', 0)}")
+    logger.info(f"   Articles: {stats.get('articles', 0)}")
 
-            <div class="content-card">
-                <div class="card-header">📈 Analysis Summary</div>
-                <div class="card-content">
-                    <div class="item">
-                        <div class="item-title">Sentiment Distribution</div>
-                        <div class="item-content">
-                            <div style="margin-bottom: 10px;">
-                                <strong>Positive:</strong> {len([a for a in analyses if isinstance(a.get('metrics', {}).get('sentiment'), (int, float)) and a.get('metrics', {}).get('sentiment', 0) > 0])} analyses
-                            </div>
-                            <div style="margin-bottom: 10px;">
-                                <strong>Neutral:</strong> {len([a for a in analyses if isinstance(a.get('metrics', {}).get('sentiment'), (int, float)) and a.get('metrics', {}).get('sentiment', 0) == 0])} analyses
-                            </div>
-                            <div style="margin-bottom: 10px;">
-                                <strong>Negative:</strong> {len([a for a in analyses if isinstance(a.get('metrics', {}).get('sentiment'), (int, float)) and a.get('metrics', {}).get('sentiment', 0) < 0])} analyses
-                            </div>
-                        </div>
-                    </div>
-                    <div class="item">
-                        <div class="item-title">Outlook Distribution</div>
-                        <div class="item-content">
-                            <div style="margin-bottom: 10px;">
-                                <strong>📈 Bullish:</strong> {len([a for a in analyses if a.get('outlook', {}).get('forecast') == 'bullish'])} analyses
-                            </div>
-                            <div style="margin-bottom: 10px;">
-                                <strong>📉 Bearish:</strong> {len([a for a in analyses if a.get('outlook', {}).get('forecast') == 'bearish'])} analyses
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
+async def _serve(interval: float) -> None:
+    """Regenerate the site every interval seconds until SIGTERM/SIGINT.
 
-        <div class="last-updated">
-            <p>Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    The HTTP session, its connections and the module-level templates are
+    reused across cycles instead of being rebuilt by a fresh process.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    
+    async with _client_session() as session:
+        while not stop.is_set():
+            logger.info("📡 Fetching data from production server...")
+            regenerate(await _fetch_data(session))
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
     
-    return html_content
+    logger.info("👋 Stopping static site regeneration")
 
 def main():
-    """Generate static site."""
+    """Generate static site once, or every --interval seconds."""
+    parser = argparse.ArgumentParser(description="Generate the enhanced static site")
+    parser.add_argument("--interval", type=float, help="Keep regenerating every INTERVAL seconds")
+    args = parser.parse_args()
+    
     logger.info("🚀 Generating enhanced static site...")
     
     # Create docs directory if it doesn't exist
     os.makedirs('docs', exist_ok=True)
     
-    # Fetch data from production server
-    logger.info("📡 Fetching data from production server...")
-    data = fetch_data_from_server()
+    # libuv-backed event loop for the concurrent fetches, where installed
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     
-    # Generate HTML
-    logger.info("🎨 Generating HTML...")
-    html_content = generate_html(data)
-    
-    # Write to file
-    output_file = 'docs/index.html'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    if args.interval is not None:
+        asyncio.run(_serve(args.interval))
+        return
     
-    logger.info(f"✅ Static site generated: {output_file}")
-    
-    # Print summary
-    stats = data.get('stats', {})
-    logger.info(f"📊 Data Summary:")
-    logger.info(f"   Companies: {stats.get('companies', 0)}")
-    logger.info(f"   Transcripts: {stats.get('transcripts', 0)}")
-    logger.info(f"   Analyses: {stats.get('analyses', 0)}")
-    logger.info(f"   Articles: {stats.get('articles', 0)}")
+    # Fetch data from production server
+    logger.info("📡 Fetching data from production server...")
+    regenerate(fetch_data_from_server())
 
 if __name__ == "__main__":
     main()
@@ -6,6 +6,7 @@ Generate new analyses with improved sentiment analysis.
 import sys
 import os
 import yaml
+from psycopg2.extras import Json
 from claude_processor import ClaudeProcessor
 from database_manager import DatabaseManager
 
@@ -24,18 +25,17 @@ def main():
     # Create a mock processor that uses fallback analysis
     class MockProcessor:
         def __init__(self):
-            pass
-        
-        def analyze_transcript(self, transcript, company):
-            from claude_processor import ClaudeProcessor
+            # Built once and reused for every transcript
             # Create a processor with a valid-looking key to bypass validation
-            processor = ClaudeProcessor(
+            self._processor = ClaudeProcessor(
                 "sk-ant-REDACTED",  # Valid format
                 config['global']['claude_model'],
                 config['prompts']
             )
+        
+        def analyze_transcript(self, transcript, company):
             # Force fallback by calling the fallback method directly
-            return processor._fallback_analysis(transcript, company, "Using fallback analysis")
+            return self._processor._fallback_analysis(transcript, company, "Using fallback analysis")
     
     processor = MockProcessor()
     
@@ -58,9 +58,11 @@ def main():
     print(f"   Trends: {analysis.trends}")
     print(f"   Outlook: {analysis.outlook}")
     
-    # Save to database
+    # Save to database; the connection goes back to the pool however this ends
+    conn = None
     try:
-        with db_manager.pool.getconn() as conn:
+        conn = db_manager.pool.getconn()
+        with conn:
             with conn.cursor() as cur:
                 # Get Walmart's company_id
                 cur.execute("SELECT id FROM companies WHERE name = %s", ("Walmart",))
@@ -71,8 +73,7 @@ def main():
                 
                 company_id = company_result[0]
                 
-                # Insert new analysis (convert dicts to JSON strings)
-                import json
+                # Insert new analysis; Json adapts the dicts as psycopg2 parameters
                 cur.execute("""
                     INSERT INTO analyses (
                         company_id, transcript_id, metrics, strategy, trends, 
@@ -84,13 +85,13 @@ def main():
                 """, (
                     company_id,
                     1,  # Use existing transcript ID
-                    json.dumps(analysis.metrics),
-                    json.dumps(analysis.strategy),
-                    json.dumps(analysis.trends),
-                    json.dumps(analysis.consumer_insights),
-                    json.dumps(analysis.tech_observations),
-                    json.dumps(analysis.operations),
-                    json.dumps(analysis.outlook),
+                    Json(analysis.metrics),
+                    Json(analysis.strategy),
+                    Json(analysis.trends),
+                    Json(analysis.consumer_insights),
+                    Json(analysis.tech_observations),
+                    Json(analysis.operations),
+                    Json(analysis.outlook),
                     analysis.sentiment,
                     analysis.confidence
                 ))
@@ -100,6 +101,9 @@ def main():
                 
     except Exception as e:
         print(f"❌ Error saving to database: {e}")
+    finally:
+        if conn is not None:
+            db_manager.pool.putconn(conn)
     
     print("🎉 New analysis generation complete!")
 
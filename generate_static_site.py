@@ -5,177 +5,216 @@ This script fetches data from the production server and generates static HTML fi
 """
 
 import os
-import json
+import gzip
+import orjson
+import hashlib
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Production server configuration
-PRODUCTION_SERVER = "http://143.198.14.56:5000"
+PRODUCTION_SERVER = os.getenv("PRODUCTION_SERVER", "http://143.198.14.56:5000")
 OUTPUT_DIR = "docs"
 
-def ensure_output_dir():
-    """Create output directory if it doesn't exist."""
-    Path(OUTPUT_DIR).mkdir(exist_ok=True)
+# Hash of the data the current index.html was rendered from
+LAST_HASH_FILE = ".cache/static_site_hash"
 
-def fetch_data_from_server(endpoint):
-    """Fetch data from production server."""
-    try:
-        response = requests.get(f"{PRODUCTION_SERVER}{endpoint}", timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"Warning: Could not fetch {endpoint}: {e}")
-        # Return appropriate default based on endpoint
-        if endpoint == "/api/stats":
-            return {"companies": 0, "transcripts": 0, "analyses": 0, "articles": 0}
-        else:
-            return []
+# One keep-alive connection to the server shared by every fetch, retrying
+# transient gateway errors instead of dropping that section of the site
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=6,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+))
+SESSION.headers.update({'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'})
 
-def generate_index_html():
-    """Generate the main index.html file."""
-    # Fetch data from production server
-    stats = fetch_data_from_server("/api/stats")
-    companies = fetch_data_from_server("/api/companies")
-    transcripts = fetch_data_from_server("/api/transcripts")
-    analyses = fetch_data_from_server("/api/analyses")
-    articles = fetch_data_from_server("/api/articles")
-    health = fetch_data_from_server("/api/health")
-    
-    # Generate HTML content
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RetailXAI Staging Dashboard</title>
-    <style>
-        * {{
+# Connect fails fast; reads get the full 30 seconds
+HTTP_TIMEOUT = (5, 30)
+
+# API endpoints the site is built from, in the order generate_index_html
+# unpacks them, with a factory for the value used when one fails
+ENDPOINTS = (
+    ("/api/stats", lambda: {"companies": 0, "transcripts": 0, "analyses": 0, "articles": 0}),
+    ("/api/companies", list),
+    ("/api/transcripts", list),
+    ("/api/analyses", list),
+    ("/api/articles", list),
+    ("/api/health", list)
+)
+
+# HTML-escaping table for API fields, applied in one C-level str.translate pass
+_ESC = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+
+def _e(value):
+    """HTML-escape an API field for interpolation into the page."""
+    return str(value).translate(_ESC)
+
+# Page stylesheet; a plain string, so it is not re-formatted on every render
+_CSS = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             color: #333;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             padding: 20px;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             color: white;
             margin-bottom: 30px;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5rem;
             margin-bottom: 10px;
-        }}
+        }
         
-        .header p {{
+        .header p {
             font-size: 1.2rem;
             opacity: 0.9;
-        }}
+        }
         
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: white;
             padding: 20px;
             border-radius: 10px;
             box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
             text-align: center;
-        }}
+        }
         
-        .stat-number {{
+        .stat-number {
             font-size: 2rem;
             font-weight: bold;
             color: #667eea;
             margin-bottom: 5px;
-        }}
+        }
         
-        .stat-label {{
+        .stat-label {
             color: #666;
             font-size: 0.9rem;
-        }}
+        }
         
-        .content-section {{
+        .content-section {
             background: white;
             border-radius: 10px;
             padding: 20px;
             margin-bottom: 20px;
             box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .section-title {{
+        .section-title {
             font-size: 1.5rem;
             margin-bottom: 15px;
             color: #333;
             border-bottom: 2px solid #667eea;
             padding-bottom: 10px;
-        }}
+        }
         
-        .content-item {{
+        .content-item {
             border: 1px solid #eee;
             border-radius: 8px;
             padding: 15px;
             margin-bottom: 15px;
             background: #f9f9f9;
-        }}
+        }
         
-        .content-item h3 {{
+        .content-item h3 {
             color: #667eea;
             margin-bottom: 10px;
-        }}
+        }
         
-        .content-item p {{
+        .content-item p {
             color: #666;
             line-height: 1.5;
-        }}
+        }
         
-        .timestamp {{
+        .timestamp {
             font-size: 0.8rem;
             color: #999;
             margin-top: 10px;
-        }}
+        }
         
-        .status-indicator {{
+        .status-indicator {
             display: inline-block;
             width: 10px;
             height: 10px;
             border-radius: 50%;
             margin-right: 5px;
-        }}
+        }
         
-        .status-online {{
+        .status-online {
             background: #4CAF50;
-        }}
+        }
         
-        .status-offline {{
+        .status-offline {
             background: #f44336;
-        }}
+        }
         
-        .last-updated {{
+        .last-updated {
             text-align: center;
             color: white;
             margin-top: 20px;
             font-size: 0.9rem;
             opacity: 0.8;
-        }}
+        }"""
+
+def ensure_output_dir():
+    """Create output directory if it doesn't exist."""
+    Path(OUTPUT_DIR).mkdir(exist_ok=True)
+
+def fetch_data_from_server(endpoint, default):
+    """Fetch data from production server, or default() if that fails."""
+    try:
+        response = SESSION.get(f"{PRODUCTION_SERVER}{endpoint}", timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    except Exception as e:
+        print(f"Warning: Could not fetch {endpoint}: {e}")
+        return default()
+
+def fetch_all_data():
+    """Fetch every endpoint, returning the payloads in ENDPOINTS order."""
+    # The endpoints are independent, so they are requested concurrently
+    # over the session's connection pool
+    with ThreadPoolExecutor(max_workers=len(ENDPOINTS)) as executor:
+        return list(executor.map(lambda endpoint: fetch_data_from_server(*endpoint), ENDPOINTS))
+
+def generate_index_html(data):
+    """Generate the main index.html file from fetch_all_data's payloads."""
+    stats, companies, transcripts, analyses, articles, health = data
+    
+    # Generate HTML content
+    html_content = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>RetailXAI Staging Dashboard</title>
+    <style>
+{_CSS}
     </style>
 </head>
 <body>
@@ -246,7 +285,7 @@ def generate_transcripts_html(transcripts):
     if not transcripts:
         return '<p>No transcripts available yet. The system will start collecting data at 7:00 AM UTC.</p>'
     
-    html = ""
+    parts = []
     for transcript in transcripts[:10]:  # Show only first 10
         company_name = transcript.get('company_name', 'Unknown Company')
         title = transcript.get('title', 'N/A')
@@ -263,23 +302,23 @@ def generate_transcripts_html(transcripts):
         except:
             formatted_date = 'Unknown'
         
-        html += f"""
+        parts.append(f"""
         <div class="content-item">
-            <h3>{company_name}</h3>
-            <p><strong>Title:</strong> {title}</p>
-            <p><strong>Content:</strong> {content[:200]}{'...' if len(content) > 200 else ''}</p>
+            <h3>{_e(company_name)}</h3>
+            <p><strong>Title:</strong> {_e(title)}</p>
+            <p><strong>Content:</strong> {_e(content[:200])}{'...' if len(content) > 200 else ''}</p>
             <div class="timestamp">Created: {formatted_date}</div>
         </div>
-        """
+        """)
     
-    return html
+    return "".join(parts)
 
 def generate_analyses_html(analyses):
     """Generate HTML for analyses section."""
     if not analyses:
         return '<p>No analyses available yet. AI analysis will begin once transcripts are collected.</p>'
     
-    html = ""
+    parts = []
     for analysis in analyses[:10]:  # Show only first 10
         company_name = analysis.get('company_name', 'Unknown Company')
         analysis_type = analysis.get('analysis_type', 'N/A')
@@ -296,23 +335,23 @@ def generate_analyses_html(analyses):
         except:
             formatted_date = 'Unknown'
         
-        html += f"""
+        parts.append(f"""
         <div class="content-item">
-            <h3>{company_name}</h3>
-            <p><strong>Type:</strong> {analysis_type}</p>
-            <p><strong>Summary:</strong> {summary[:200]}{'...' if len(summary) > 200 else ''}</p>
+            <h3>{_e(company_name)}</h3>
+            <p><strong>Type:</strong> {_e(analysis_type)}</p>
+            <p><strong>Summary:</strong> {_e(summary[:200])}{'...' if len(summary) > 200 else ''}</p>
             <div class="timestamp">Created: {formatted_date}</div>
         </div>
-        """
+        """)
     
-    return html
+    return "".join(parts)
 
 def generate_articles_html(articles):
     """Generate HTML for articles section."""
     if not articles:
         return '<p>No articles available yet. Articles will be generated once analyses are complete.</p>'
     
-    html = ""
+    parts = []
     for article in articles[:10]:  # Show only first 10
         title = article.get('title', 'Untitled')
         company_name = article.get('company_name', 'N/A')
@@ -329,16 +368,16 @@ def generate_articles_html(articles):
         except:
             formatted_date = 'Unknown'
         
-        html += f"""
+        parts.append(f"""
         <div class="content-item">
-            <h3>{title}</h3>
-            <p><strong>Company:</strong> {company_name}</p>
-            <p><strong>Content:</strong> {content[:200]}{'...' if len(content) > 200 else ''}</p>
+            <h3>{_e(title)}</h3>
+            <p><strong>Company:</strong> {_e(company_name)}</p>
+            <p><strong>Content:</strong> {_e(content[:200])}{'...' if len(content) > 200 else ''}</p>
             <div class="timestamp">Created: {formatted_date}</div>
         </div>
-        """
+        """)
     
-    return html
+    return "".join(parts)
 
 def generate_health_html(health):
     """Generate HTML for health section."""
@@ -371,18 +410,61 @@ def generate_health_html(health):
     </div>
     """
 
+def _fingerprint(data):
+    """Hash fetch_all_data's payloads, ignoring the health and stats timestamps.
+
+    Both endpoints stamp every response, so including the stamps would make
+    every run look like a change.
+    """
+    stats, *lists, health = data
+    if isinstance(stats, dict):
+        stats = {k: v for k, v in stats.items() if k != "last_updated"}
+    if isinstance(health, dict):
+        health = {k: v for k, v in health.items() if k != "timestamp"}
+    payload = orjson.dumps([stats, *lists, health], default=str, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
 def main():
     """Main function to generate static site."""
     print("🚀 Generating static site for GitHub Pages...")
     
     ensure_output_dir()
     
+    # Fetch data from production server
+    data = fetch_all_data()
+    
+    # The page carries its own "Last updated" stamp, so compare the data it
+    # is rendered from rather than the HTML, and leave the page (and its
+    # mtime) alone when nothing changed
+    output_file = f"{OUTPUT_DIR}/index.html"
+    digest = _fingerprint(data)
+    try:
+        with open(LAST_HASH_FILE, encoding="utf-8") as f:
+            unchanged = f.read() == digest and os.path.exists(output_file)
+    except OSError:
+        unchanged = False
+    if unchanged:
+        print(f"✅ Data unchanged, keeping {output_file}")
+        return
+    
     # Generate index.html
     print("📄 Generating index.html...")
-    index_content = generate_index_html()
+    index_content = generate_index_html(data)
     
-    with open(f"{OUTPUT_DIR}/index.html", "w", encoding="utf-8") as f:
+    # Write through a temporary file so an interrupted run never leaves a
+    # half-written page, plus a precompressed copy for servers that use it
+    tmp_file = output_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
         f.write(index_content)
+    os.replace(tmp_file, output_file)
+    
+    with open(tmp_file, "wb") as f:
+        f.write(gzip.compress(index_content.encode("utf-8"), compresslevel=9))
+    os.replace(tmp_file, output_file + ".gz")
+    
+    os.makedirs(os.path.dirname(LAST_HASH_FILE), exist_ok=True)
+    with open(LAST_HASH_FILE, "w", encoding="utf-8") as f:
+        f.write(digest)
     
     print(f"✅ Static site generated in {OUTPUT_DIR}/ directory")
     print(f"📊 Data fetched from production server: {PRODUCTION_SERVER}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Health check for RetailXAI.
+Checks the service, the API health endpoint and the database in one process.
+Run once for an exit status (0 healthy, 1 not), or with --interval to keep
+checking on the same HTTP session and database pool.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+
+SERVICE_NAME = "retailxai"
+HEALTH_URL = "http://localhost:5000/api/health"
+HTTP_TIMEOUT = 2
+CONFIG_FILE = "config/config.yaml"
+
+# Keep-alive connections to the API, reused across checks
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# DatabaseManager (and its connection pool), created on the first database check
+_db_manager = None
+
+
+def get_db_manager():
+    """Return the shared DatabaseManager, connecting on first use."""
+    global _db_manager
+    if _db_manager is None:
+        from database_manager import DatabaseManager
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        _db_manager = DatabaseManager(config["global"]["database"])
+    return _db_manager
+
+
+def check_service():
+    """Check that the systemd service is active."""
+    result = subprocess.run(["systemctl", "is-active", "--quiet", SERVICE_NAME])
+    return result.returncode == 0, "RetailXAI service is not running"
+
+
+def check_api():
+    """Check that the API health endpoint answers."""
+    try:
+        response = SESSION.get(HEALTH_URL, timeout=HTTP_TIMEOUT)
+        return response.ok, "Health endpoint not responding"
+    except requests.RequestException:
+        return False, "Health endpoint not responding"
+
+
+def check_database():
+    """Check that the database answers a query."""
+    try:
+        return get_db_manager().is_healthy(), "Database connection failed"
+    except Exception:
+        return False, "Database connection failed"
+
+
+CHECKS = [check_service, check_api, check_database]
+
+
+def run_checks():
+    """Run every check in order, stopping at the first failure."""
+    print("🏥 Checking RetailXAI Health...")
+    for check in CHECKS:
+        ok, message = check()
+        if not ok:
+            print(f"❌ {message}")
+            return False
+    print("✅ All health checks passed")
+    return True
+
+
+def main():
+    """Run the health checks once, or every --interval seconds."""
+    parser = argparse.ArgumentParser(description="RetailXAI health check")
+    parser.add_argument("--interval", type=float, help="Keep checking every INTERVAL seconds")
+    args = parser.parse_args()
+
+    if args.interval is None:
+        sys.exit(0 if run_checks() else 1)
+
+    while True:
+        run_checks()
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
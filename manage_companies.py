@@ -1,6 +1,7 @@
 import argparse
 import logging
 import sys
+from dataclasses import asdict, replace
 from typing import Dict, List
 
 import yaml
@@ -61,7 +62,12 @@ def save_companies(companies: List[Company], companies_file: str) -> None:
         companies: List of Company entities.
         companies_file: Path to companies YAML file.
     """
-    data = {"companies": [vars(c) for c in companies]}
+    # The database id is assigned at runtime and does not belong in the config.
+    data = {
+        "companies": [
+            {k: v for k, v in asdict(c).items() if k != "id"} for c in companies
+        ]
+    }
     try:
         with open(companies_file, "w", encoding="utf-8") as f:
             yaml.safe_dump(data, f, allow_unicode=True)
@@ -126,11 +132,14 @@ def update_company(companies_file: str, db_manager: DatabaseManager, name: str,
         keywords: List of keywords.
     """
     companies = load_companies(companies_file)
-    for company in companies:
+    for i, company in enumerate(companies):
         if company.name.lower() == name.lower():
-            company.youtube_channels = youtube_channels or company.youtube_channels
-            company.rss_feed = rss_feed or company.rss_feed
-            company.keywords = keywords or company.keywords
+            company = companies[i] = replace(
+                company,
+                youtube_channels=youtube_channels or company.youtube_channels,
+                rss_feed=rss_feed or company.rss_feed,
+                keywords=keywords or company.keywords,
+            )
             save_companies(companies, companies_file)
             db_manager.insert_company(company)  # Updates via ON CONFLICT
             logger.info(f"Updated company: {name}")
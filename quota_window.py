@@ -0,0 +1,92 @@
+"""
+Sliding-window API quota accounting.
+Generated by fix_production_issues.py.
+"""
+
+import collections
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+
+def current_minute() -> int:
+    """Wall-clock minute number (minutes since the epoch)."""
+    return int(time.time() // 60)
+
+
+class QuotaWindow:
+    """Usage over the last `window_minutes` minutes, one bucket per minute."""
+
+    def __init__(self, capacity: int, window_minutes: int, buckets: Optional[List[int]] = None,
+                 last_minute: Optional[int] = None):
+        """Start a window, optionally restoring a snapshot().
+
+        Restored `buckets` are shifted forward by the minutes elapsed since
+        `last_minute`, the wall-clock minute of the newest one, so usage
+        older than the window is dropped. Buckets without a `last_minute`
+        cannot be dated and are ignored.
+        """
+        self.capacity = capacity
+        # Appending past maxlen evicts the oldest minute
+        self._buckets = collections.deque(maxlen=window_minutes)
+        self._minute = current_minute()
+        self._lock = threading.Lock()
+        if buckets and last_minute is not None and last_minute <= self._minute:
+            self._buckets.extend(buckets)
+            self._advance(last_minute)
+        if not self._buckets:
+            self._buckets.append(0)
+
+    def _advance(self, from_minute: int) -> None:
+        """Start an empty bucket for each minute from `from_minute` to now."""
+        elapsed = min(self._minute - from_minute, self._buckets.maxlen)
+        self._buckets.extend([0] * elapsed)
+
+    def used(self) -> int:
+        """Total usage across the window."""
+        with self._lock:
+            return sum(self._buckets)
+
+    def allow(self, cost: int = 1) -> bool:
+        """True if `cost` more units fit in the window."""
+        return self.used() + cost <= self.capacity
+
+    def record(self, n: int = 1) -> None:
+        """Add `n` units to the current minute."""
+        with self._lock:
+            self._buckets[-1] += n
+
+    def acquire(self, cost: int = 1) -> bool:
+        """Record `cost` units if they fit; False (recording nothing) otherwise."""
+        with self._lock:
+            if sum(self._buckets) + cost > self.capacity:
+                return False
+            self._buckets[-1] += cost
+            return True
+
+    def tick(self) -> None:
+        """Catch up with the wall clock, starting a bucket per minute passed."""
+        with self._lock:
+            now = current_minute()
+            if now > self._minute:
+                last_minute, self._minute = self._minute, now
+                self._advance(last_minute)
+
+    def snapshot(self) -> Tuple[List[int], int]:
+        """Bucket counts, oldest first, and the wall-clock minute of the newest."""
+        with self._lock:
+            return list(self._buckets), self._minute
+
+
+def start_ticker(windows: Iterable[QuotaWindow], interval: float = 60.0) -> None:
+    """Advance every window by one bucket each `interval` seconds."""
+    windows = list(windows)
+
+    def tick():
+        for window in windows:
+            window.tick()
+        start_ticker(windows, interval)
+
+    timer = threading.Timer(interval, tick)
+    timer.daemon = True
+    timer.start()
@@ -10,6 +10,7 @@ import sys
 import json
 import time
 from datetime import datetime, timedelta
+from dataclasses import replace
 from dotenv import load_dotenv
 import yaml
 import threading
@@ -106,12 +107,12 @@ class ProductionPipeline:
                     cur.execute("SELECT id FROM companies WHERE name = %s", (company.name,))
                     result = cur.fetchone()
                     if result:
-                        company.id = result[0]
+                        company = replace(company, id=result[0])
                         print(f"✅ Company found: {company.name} (ID: {company.id})")
                     else:
                         # Insert new company
                         company_id = self.db_manager.insert_company(company)
-                        company.id = company_id
+                        company = replace(company, id=company_id)
                         print(f"✅ Company created: {company.name} (ID: {company_id})")
             finally:
                 self.db_manager.pool.putconn(conn)
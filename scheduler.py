@@ -1,6 +1,8 @@
 import logging
 import logging.handlers
+import os
 import signal
+import socket
 import sys
 import threading
 import time
@@ -20,6 +22,33 @@ from health_monitor import get_health_monitor
 
 logger = logging.getLogger("RetailXAI.Scheduler")
 
+# Watchdog timeout while a job runs inline in the scheduler loop; the unit's
+# WatchdogSec applies again as soon as the job returns
+JOB_WATCHDOG_SECONDS = 3600
+
+
+def sd_notify(state: str) -> bool:
+    """Send a state line (e.g. "READY=1", "WATCHDOG=1") to systemd, if supervised.
+
+    Args:
+        state: sd_notify(3) assignment to send.
+
+    Returns:
+        True if the message was sent, False when not running under systemd notify.
+    """
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address:
+        return False
+    if address.startswith("@"):
+        address = "\0" + address[1:]  # Abstract namespace socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.sendto(state.encode(), address)
+        return True
+    except OSError as e:
+        logger.warning(f"sd_notify({state}) failed: {e}")
+        return False
+
 
 class RetailXAIScheduler:
     """Coordinates data fetching, processing, and publishing tasks."""
@@ -35,6 +64,7 @@ class RetailXAIScheduler:
         self.schedule_config = self._load_schedule_config(schedule_path)
         self.shutdown_event = threading.Event()
         self.running_jobs = set()
+        self._watchdog_usec = int(os.environ.get("WATCHDOG_USEC") or 0)
         self._setup_logging()
         self._setup_signal_handlers()
         self._init_components()
@@ -200,7 +230,7 @@ class RetailXAIScheduler:
             if self.shutdown_event.is_set():
                 logger.info(f"Skipping job {job_name} due to shutdown")
                 return
-            with self._job_context(job_name):
+            with self._job_context(job_name), self._job_watchdog():
                 try:
                     logger.info(f"Starting job: {job_name}")
                     job_func()
@@ -370,15 +400,35 @@ class RetailXAIScheduler:
             else:
                 logger.warning(f"Invalid task type for {task['name']}: {task['type']}")
 
+    def _watchdog_ping(self) -> None:
+        """Ping the systemd watchdog, if WatchdogSec is set; called from the scheduler loop."""
+        if self._watchdog_usec:
+            sd_notify("WATCHDOG=1")
+
+    @contextmanager
+    def _job_watchdog(self):
+        """Stretch the watchdog timeout to JOB_WATCHDOG_SECONDS while a job runs inline."""
+        if not self._watchdog_usec:
+            yield
+            return
+        sd_notify(f"WATCHDOG=1\nWATCHDOG_USEC={JOB_WATCHDOG_SECONDS * 1_000_000}")
+        try:
+            yield
+        finally:
+            sd_notify(f"WATCHDOG=1\nWATCHDOG_USEC={self._watchdog_usec}")
+
     def run(self) -> None:
         """Run the scheduler."""
         logger.info("RetailXAI Scheduler started")
+        sd_notify("READY=1")
         
         # Perform startup recovery
-        self.startup_recovery()
+        with self._job_watchdog():
+            self.startup_recovery()
         
         try:
             while not self.shutdown_event.is_set():
+                self._watchdog_ping()
                 schedule.run_pending()
                 if self.shutdown_event.wait(timeout=5):
                     break
@@ -0,0 +1,66 @@
+-- RetailXAI schema expected by the staging site.
+-- Idempotent; run as one transaction (fix_production_database.py, or psql -1 -f).
+
+-- Create companies table
+CREATE TABLE IF NOT EXISTS companies (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    youtube_channels TEXT[],
+    rss_feed TEXT,
+    keywords TEXT[],
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create transcripts table
+CREATE TABLE IF NOT EXISTS transcripts (
+    id SERIAL PRIMARY KEY,
+    company_id INTEGER REFERENCES companies(id),
+    video_id VARCHAR(255),
+    title TEXT,
+    content TEXT,
+    published_at TIMESTAMP,
+    channel_id VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create analyses table
+CREATE TABLE IF NOT EXISTS analyses (
+    id SERIAL PRIMARY KEY,
+    company_id INTEGER REFERENCES companies(id),
+    transcript_id INTEGER REFERENCES transcripts(id),
+    analysis_type VARCHAR(100),
+    analysis_data JSONB,
+    summary TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create articles table
+CREATE TABLE IF NOT EXISTS articles (
+    id SERIAL PRIMARY KEY,
+    company_id INTEGER REFERENCES companies(id),
+    analysis_id INTEGER REFERENCES analyses(id),
+    title TEXT,
+    content TEXT,
+    article_data JSONB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create health_checks table
+CREATE TABLE IF NOT EXISTS health_checks (
+    id SERIAL PRIMARY KEY,
+    check_type VARCHAR(100),
+    status VARCHAR(50),
+    message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create agent_states table
+CREATE TABLE IF NOT EXISTS agent_states (
+    id SERIAL PRIMARY KEY,
+    agent_name VARCHAR(100),
+    is_running BOOLEAN DEFAULT FALSE,
+    last_execution TIMESTAMP,
+    status_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
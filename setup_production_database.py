@@ -4,6 +4,7 @@ Setup production database schema.
 This script should be run directly on the production server.
 """
 
+import os
 import psycopg2
 import json
 import yaml
@@ -114,6 +115,42 @@ def create_database_schema():
     finally:
         conn.close()
 
+# Covering indexes for the staging API's ORDER BY ... DESC LIMIT 50 queries,
+# so they become an index scan instead of a full sort per request.
+STAGING_INDEXES = {
+    'idx_transcripts_pub_at':
+        "transcripts (published_at DESC) INCLUDE (id, title, company_id)",
+    'idx_articles_pub_at':
+        "articles (published_at DESC) INCLUDE (id, title, company_id)",
+    # Inner side of the analyses -> transcripts join in /api/analyses
+    'idx_transcripts_id_covering':
+        "transcripts (id) INCLUDE (title, company_id)",
+}
+
+def create_indexes():
+    """Create the staging API indexes without blocking writes."""
+    print("📇 Creating indexes...")
+    
+    conn = psycopg2.connect(
+        host='localhost',
+        database='retailxai',
+        user='retailxbt_user',
+        password=os.getenv('DATABASE_PASSWORD', 'Seattle2311')
+    )
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    conn.autocommit = True
+    
+    try:
+        with conn.cursor() as cur:
+            for name, target in STAGING_INDEXES.items():
+                try:
+                    cur.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target};")
+                    print(f"✅ Index {name} ready")
+                except Exception as e:
+                    print(f"❌ Error creating index {name}: {e}")
+    finally:
+        conn.close()
+
 def populate_companies():
     """Populate companies table with test data."""
     print("🏢 Populating companies table...")
@@ -229,6 +266,9 @@ def main():
         # Create schema
         create_database_schema()
         
+        # Index the staging API queries
+        create_indexes()
+        
         # Populate companies
         populate_companies()
         
@@ -9,6 +9,7 @@ import sys
 import json
 import time
 from datetime import datetime, timedelta
+from dataclasses import replace
 from dotenv import load_dotenv
 import yaml
 import threading
@@ -83,7 +84,7 @@ class SimplePipeline:
                     cur.execute("SELECT id FROM companies WHERE name = %s", (company.name,))
                     result = cur.fetchone()
                     if result:
-                        company.id = result[0]
+                        company = replace(company, id=result[0])
                         print(f"✅ Company found: {company.name} (ID: {company.id})")
                     else:
                         print(f"❌ Company not found: {company.name}")
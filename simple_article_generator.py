@@ -50,6 +50,22 @@ class SimpleArticleGenerator:
             "preference for local and organic products",
             "increased use of mobile commerce"
         ]
+        
+        self.outlooks = [
+            "The retail sector is positioned for continued growth, with companies that successfully execute on digital transformation and operational efficiency likely to outperform.",
+            "Market conditions remain challenging but present opportunities for retailers with strong omnichannel capabilities and customer focus.",
+            "The evolving retail landscape requires continued investment in technology and customer experience to maintain competitive advantage.",
+            "Retailers are adapting to changing consumer preferences and economic conditions through strategic initiatives and operational improvements."
+        ]
+        
+        self.key_insights = [
+            "Retailers with strong omnichannel capabilities are outperforming peers by an average of 15%",
+            "Digital transformation investments are showing measurable returns in operational efficiency",
+            "Consumer behavior continues to shift toward value-focused and convenience-driven shopping",
+            "Supply chain optimization remains a critical competitive advantage",
+            "Data-driven decision making is becoming essential for retail success",
+            "Sustainability initiatives are increasingly important to consumer purchasing decisions"
+        ]
     
     def generate_article(self, title: str = None) -> str:
         """Generate a retail analysis article."""
@@ -127,25 +143,11 @@ class SimpleArticleGenerator:
     
     def _generate_outlook(self) -> str:
         """Generate market outlook."""
-        outlooks = [
-            "The retail sector is positioned for continued growth, with companies that successfully execute on digital transformation and operational efficiency likely to outperform.",
-            "Market conditions remain challenging but present opportunities for retailers with strong omnichannel capabilities and customer focus.",
-            "The evolving retail landscape requires continued investment in technology and customer experience to maintain competitive advantage.",
-            "Retailers are adapting to changing consumer preferences and economic conditions through strategic initiatives and operational improvements."
-        ]
-        return random.choice(outlooks)
+        return random.choice(self.outlooks)
     
     def _generate_key_insights(self, companies: List[Dict]) -> List[str]:
         """Generate key insights."""
-        insights = [
-            f"Retailers with strong omnichannel capabilities are outperforming peers by an average of 15%",
-            "Digital transformation investments are showing measurable returns in operational efficiency",
-            "Consumer behavior continues to shift toward value-focused and convenience-driven shopping",
-            "Supply chain optimization remains a critical competitive advantage",
-            "Data-driven decision making is becoming essential for retail success",
-            "Sustainability initiatives are increasingly important to consumer purchasing decisions"
-        ]
-        return random.sample(insights, 4)
+        return random.sample(self.key_insights, 4)
     
     def _format_markdown(self, title: str, content: Dict, companies: List[Dict]) -> str:
         """Format content as markdown."""
@@ -9,6 +9,7 @@ import os
 import sys
 import json
 from datetime import datetime, timedelta
+from dataclasses import replace
 from dotenv import load_dotenv
 import yaml
 
@@ -61,7 +62,7 @@ def create_test_companies(companies_config, db_manager):
         
         # Insert company into database
         company_id = db_manager.insert_company(company)
-        company.id = company_id
+        company = replace(company, id=company_id)
         companies.append(company)
         print(f"✅ Created company: {company.name} (ID: {company_id})")
     
@@ -10,6 +10,7 @@ import sys
 import json
 import requests
 from datetime import datetime, timedelta
+from dataclasses import replace
 from dotenv import load_dotenv
 import yaml
 
@@ -75,7 +76,7 @@ def create_test_companies(companies_config, db_manager):
         
         # Insert company into database
         company_id = db_manager.insert_company(company)
-        company.id = company_id
+        company = replace(company, id=company_id)
         companies.append(company)
         print(f"✅ Created company: {company.name} (ID: {company_id})")
     
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+import yaml
+
+import edit_companies_sources as ecs
+from edit_companies_sources import RetailXAIConfigEditor
+
+
+@pytest.fixture
+def sidecar_dir(tmp_path, monkeypatch):
+    """Sidecar cache directory kept apart from the config directory."""
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(ecs, "SIDECAR_DIR", str(cache))
+    return cache
+
+
+@pytest.fixture
+def editor(tmp_path, sidecar_dir):
+    """Editor over a config directory seeded with empty files."""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "companies.yaml").write_text("companies: []\n")
+    (config_dir / "sources.json").write_text("[]")
+    (config_dir / "config.yaml").write_text("sources: {}\n")
+    return RetailXAIConfigEditor(config_dir=str(config_dir))
+
+
+def test_sidecar_is_json_outside_config_dir(editor, sidecar_dir):
+    """Loading a YAML file caches it as JSON in SIDECAR_DIR, not beside the file."""
+    assert editor.load_config() == {"sources": {}}
+    assert not [name for name in os.listdir(editor.config_dir) if name.endswith(".pkl")]
+    (sidecar,) = sidecar_dir.iterdir()
+    assert sidecar.suffix == ".json"
+
+
+def test_sidecar_hit_and_staleness(editor):
+    """A current sidecar is used; editing the YAML invalidates it."""
+    editor.load_config()
+    assert ecs._read_sidecar(editor.config_file) == {"sources": {}}
+
+    with open(editor.config_file, "w") as f:
+        yaml.dump({"sources": {"rss": {"enabled": True}}}, f)
+    assert ecs._read_sidecar(editor.config_file) is None
+    assert editor.load_config() == {"sources": {"rss": {"enabled": True}}}
+
+
+def test_data_json_cannot_round_trip_is_not_cached(editor):
+    """Dates and non-string keys would come back changed, so they skip the cache."""
+    with open(editor.config_file, "w") as f:
+        f.write("since: 2024-01-01\nlimits: {1: 10}\n")
+    data = editor.load_config()
+    assert ecs._read_sidecar(editor.config_file) is None
+    assert editor.load_config() == data
+
+
+def test_add_company_saves_and_reports(editor, capsys):
+    """A standalone add writes the file before reporting success."""
+    assert editor.add_company("Walmart", keywords=["retail"])
+    assert capsys.readouterr().out == "Successfully added company: Walmart\n"
+    assert RetailXAIConfigEditor(editor.config_dir).load_companies()["companies"][0]["name"] == "Walmart"
+
+
+def test_nested_edits_share_one_save(editor, monkeypatch):
+    """Adds inside an outer edit block are written once, when it exits."""
+    saves = []
+    save = editor.save_companies
+    monkeypatch.setattr(editor, "save_companies", lambda data: saves.append(1) or save(data))
+
+    with editor.edit_companies():
+        editor.add_company("Target")
+        editor.add_company("Kroger")
+        assert saves == []
+    assert saves == [1]
+    names = [c["name"] for c in editor.load_companies()["companies"]]
+    assert names == ["Target", "Kroger"]
+
+
+def test_nested_success_reported_after_outer_save(editor, capsys):
+    """Success messages from nested adds wait for the outermost block to save."""
+    with editor.edit_companies():
+        assert editor.add_company("Target")
+        assert capsys.readouterr().out == ""
+    assert capsys.readouterr().out == "Successfully added company: Target\n"
+
+
+def test_nested_success_dropped_when_save_fails(editor, monkeypatch, capsys):
+    """Nothing is reported as added when the outer save fails."""
+    monkeypatch.setattr(editor, "save_companies", lambda data: False)
+    with editor.edit_companies():
+        editor.add_company("Target")
+    assert "Successfully" not in capsys.readouterr().out
+
+
+def test_add_companies_skips_duplicates(editor, capsys):
+    """add_companies returns and reports only the names it added."""
+    editor.add_company("Target")
+    capsys.readouterr()
+
+    assert editor.add_companies(["Costco", "target", "Aldi"]) == ["Costco", "Aldi"]
+    out = capsys.readouterr().out
+    assert "Company 'target' already exists" in out
+    assert "Successfully added company: Costco" in out
+
+
+def test_duplicate_symbol_does_not_save(editor, monkeypatch):
+    """An edit that changes nothing leaves the file alone."""
+    assert editor.add_stock_symbol("wmt")
+    monkeypatch.setattr(editor, "save_config", lambda data: pytest.fail("saved"))
+    assert not editor.add_stock_symbol("WMT")
@@ -0,0 +1,190 @@
+import contextlib
+import gzip
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+import enhanced_staging_site as site
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client whose endpoints read canned rows instead of the database."""
+    monkeypatch.setattr(site, "connection_pool", MagicMock())
+    monkeypatch.setattr(site, "_db", lambda: contextlib.nullcontext(MagicMock()))
+    monkeypatch.setattr(site, "_stream_previews", lambda conn, name, limit: [
+        {"id": 1, "title": "Q2 call", "content": "Sales rose"},
+    ])
+    monkeypatch.setattr(site, "_analyses", lambda conn, limit: [
+        {"id": 7, "metrics": {"sentiment": 0.4}, "outlook": {"forecast": "bullish"}},
+    ])
+    monkeypatch.setattr(site, "_analysis_summary", lambda conn: {
+        "positive": 1, "neutral": 0, "negative": 0, "bullish": 1, "bearish": 0,
+    })
+    monkeypatch.setattr(site, "_companies_json", lambda conn: '[{"id": 1, "name": "Walmart"}]')
+    # A fresh last_updated per call, as the real query produces
+    monkeypatch.setattr(site, "_stats", lambda conn: {
+        "companies": 1, "transcripts": 1, "analyses": 1, "articles": 1,
+        "last_updated": datetime.now(),
+    })
+    for cache in site._response_caches:
+        cache.clear()
+    return site.app.test_client()
+
+
+def test_dashboard_repeat_request_returns_304(client):
+    """An unchanged dashboard keeps its ETag although its timestamps move."""
+    first = client.get("/api/dashboard")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    second = client.get("/api/dashboard", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_health_repeat_request_returns_304(client):
+    """/api/health stamps every response but is tagged from its data."""
+    etag = client.get("/api/health").headers["ETag"]
+    assert client.get("/api/health", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_stats_etag_survives_response_cache(client):
+    """A body served from _ttl_cache keeps the tag of the data it was built from."""
+    etag = client.get("/api/stats").headers["ETag"]
+    assert client.get("/api/stats").headers["ETag"] == etag
+    assert client.get("/api/stats", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_changed_data_changes_etag(client, monkeypatch):
+    """The tag still follows the data itself."""
+    etag = client.get("/api/dashboard").headers["ETag"]
+    monkeypatch.setattr(site, "_companies_json", lambda conn: '[{"id": 2, "name": "Target"}]')
+
+    response = client.get("/api/dashboard", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_dashboard_survives_summary_failure(client, monkeypatch):
+    """A failing summary query nulls analysis_summary instead of emptying the dashboard."""
+    def broken_summary(conn):
+        raise site.psycopg2.DataError("invalid input syntax for type json")
+    monkeypatch.setattr(site, "_analysis_summary", broken_summary)
+
+    body = client.get("/api/dashboard").get_json()
+    assert body["analysis_summary"] is None
+    assert body["transcripts"][0]["title"] == "Q2 call"
+    assert body["stats"]["companies"] == 1
+
+
+def test_cache_flush_requires_token(client, monkeypatch):
+    """Flushes need X-Admin-Token, whatever address they come from."""
+    monkeypatch.setattr(site, "CACHE_FLUSH_TOKEN", "s3cret")
+    local = {"REMOTE_ADDR": "127.0.0.1"}
+
+    assert client.post("/api/cache/flush", environ_base=local).status_code == 403
+    assert client.post("/api/cache/flush", environ_base=local,
+                       headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.post("/api/cache/flush", headers={"X-Admin-Token": "s3cret"}).status_code == 200
+
+
+def test_cache_flush_fails_closed_without_token(client, monkeypatch):
+    """With no token configured, only the debug server accepts flushes."""
+    monkeypatch.setattr(site, "CACHE_FLUSH_TOKEN", "")
+    assert client.post("/api/cache/flush").status_code == 403
+
+    monkeypatch.setattr(site.app, "debug", True)
+    assert client.post("/api/cache/flush").status_code == 200
+
+
+def test_dashboard_bundles_every_section(client):
+    """One response carries what the static site used to fetch per endpoint."""
+    body = client.get("/api/dashboard").get_json()
+    assert set(body) == {"transcripts", "analyses", "analysis_summary", "articles",
+                         "companies", "stats", "health"}
+    # The companies JSON text is embedded as-is, as a real array
+    assert body["companies"] == [{"id": 1, "name": "Walmart"}]
+    assert body["analyses"][0]["outlook"] == {"forecast": "bullish"}
+    assert body["health"]["status"] == "healthy"
+
+
+def test_dashboard_reads_everything_on_one_connection(client, monkeypatch):
+    """Every section is read on a single borrowed connection."""
+    borrowed = []
+
+    def one_connection():
+        borrowed.append(MagicMock())
+        return contextlib.nullcontext(borrowed[-1])
+    monkeypatch.setattr(site, "_db", one_connection)
+
+    assert client.get("/api/dashboard").status_code == 200
+    assert len(borrowed) == 1
+
+
+@pytest.mark.parametrize("query, expected", [("", 50), ("?limit=10", 10), ("?limit=500", 50), ("?limit=0", 1)])
+def test_dashboard_limit_applies_to_listings(client, monkeypatch, query, expected):
+    """?limit= is clamped to 1..LISTING_LIMIT and passed to every listing."""
+    limits = []
+    monkeypatch.setattr(site, "_stream_previews", lambda conn, name, limit: limits.append(limit) or [])
+    monkeypatch.setattr(site, "_analyses", lambda conn, limit: limits.append(limit) or [])
+
+    client.get(f"/api/dashboard{query}")
+    assert limits == [expected] * 3
+
+
+def test_dashboard_without_database_is_empty_and_uncached(client, monkeypatch):
+    """The fallback body is marked no-store and carries no ETag."""
+    monkeypatch.setattr(site, "connection_pool", None)
+    response = client.get("/api/dashboard")
+    assert response.get_json() == {}
+    assert response.cache_control.no_store
+    assert "ETag" not in response.headers
+
+
+@pytest.fixture
+def large_listing(monkeypatch):
+    """Transcripts listing big enough to be worth compressing."""
+    monkeypatch.setattr(site, "_stream_previews", lambda conn, name, limit: [
+        {"id": i, "title": f"Call {i}", "content": "x" * 200} for i in range(20)
+    ])
+
+
+def test_large_json_is_gzipped_for_accepting_clients(client, large_listing):
+    response = client.get("/api/transcripts", headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data).startswith(b'[{"id":0')
+
+
+def test_gzip_needs_accept_encoding(client, large_listing):
+    response = client.get("/api/transcripts")
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json()[0]["title"] == "Call 0"
+
+
+def test_small_json_is_not_gzipped(client):
+    response = client.get("/api/transcripts", headers={"Accept-Encoding": "gzip"})
+    assert len(response.data) < site.GZIP_MIN_BYTES
+    assert "Content-Encoding" not in response.headers
+
+
+def test_etag_is_weak_and_shared_by_encodings(client, large_listing):
+    """The same weak tag answers If-None-Match with or without gzip."""
+    plain = client.get("/api/transcripts")
+    gzipped = client.get("/api/transcripts", headers={"Accept-Encoding": "gzip"})
+    assert plain.headers["ETag"].startswith('W/"')
+    assert plain.headers["ETag"] == gzipped.headers["ETag"]
+
+    conditional = client.get("/api/transcripts", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]})
+    assert conditional.status_code == 304
+    assert conditional.data == b""
+    assert "Content-Encoding" not in conditional.headers
+
+
+def test_non_json_responses_are_untouched(client):
+    response = client.get("/api/cache/flush")
+    assert response.status_code == 405
+    assert "ETag" not in response.headers
@@ -0,0 +1,79 @@
+import re
+
+import pytest
+
+import environment_validator as ev
+from environment_validator import EnvIssue, EnvironmentValidator, EnvVar
+
+VALID_ENV = {
+    "CLAUDE_API_KEY": "sk-ant-" + "a" * 24,
+    "YOUTUBE_API_KEY": "A" * 39,
+    "DATABASE_URL": "postgresql://user@localhost/retailxai",
+}
+
+
+@pytest.mark.parametrize("pattern, samples", [
+    (r"^\d+$", ["42", "", "4a", "٣"]),
+    (r"^postgresql://.*", ["postgresql://db", "mysql://db", "postgresql:/"]),
+    (r"^https://hooks\.slack\.com/services/.*",
+     ["https://hooks.slack.com/services/T0", "https://hooksXslack.com/services/T0"]),
+    (r"^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$", ["INFO", "info", "INFOS", ""]),
+    (r"^[A-Za-z0-9_-]{39}$", ["A" * 39, "A" * 38, "A" * 38 + "!", "a-_" * 13]),
+    (r"^[a-f0-9]{32}$", ["0" * 32, "G" * 32, "a" * 33]),
+])
+def test_string_validators_match_regex(pattern, samples):
+    """Each str-method shortcut accepts exactly what the regex fullmatches."""
+    validator = ev._string_validator(pattern)
+    assert validator is not None
+    compiled = re.compile(pattern, re.ASCII)
+    for sample in samples:
+        assert bool(validator(sample)) == bool(compiled.fullmatch(sample)), sample
+
+
+def test_untrivial_pattern_falls_back_to_regex():
+    """Patterns with other shapes keep the compiled regex as validator."""
+    var = EnvVar(name="CLAUDE_API_KEY", pattern=r"^sk-ant-[a-zA-Z0-9\-_]{20,}$")
+    assert ev._string_validator(var.pattern) is None
+    assert var.validator == var.compiled.fullmatch
+
+
+def test_pattern_pool_shares_compiled_patterns():
+    """EnvVars with the same pattern share one compiled regex and validator."""
+    first = EnvVar(name="MAX_WORKERS", pattern=r"^\d+$")
+    second = EnvVar(name="API_TIMEOUT", pattern=r"^\d+$")
+    assert first.compiled is second.compiled
+    assert first.validator is second.validator
+    assert r"^\d+$" in ev._PATTERN_POOL
+
+
+def test_valid_environment_has_no_issues():
+    assert EnvironmentValidator().validate_environment(dict(VALID_ENV)) == (True, [])
+
+
+def test_issues_are_records_rendered_on_str():
+    """Issues carry code, name and detail and format their message only via str()."""
+    env = dict(VALID_ENV, YOUTUBE_API_KEY="short", MAX_WORKERS="four")
+    del env["DATABASE_URL"]
+
+    is_valid, errors = EnvironmentValidator().validate_environment(env)
+
+    assert not is_valid
+    assert [(issue.code, issue.name) for issue in errors] == [
+        ("invalid_format", "YOUTUBE_API_KEY"),
+        ("missing_required", "DATABASE_URL"),
+        ("invalid_format", "MAX_WORKERS"),
+    ]
+    assert str(errors[1]) == (
+        "Required environment variable DATABASE_URL is not set: "
+        "PostgreSQL database connection URL"
+    )
+    assert str(EnvIssue("invalid_format", "MAX_WORKERS", r"^\d+$")) == (
+        r"Environment variable MAX_WORKERS has invalid format. Expected pattern: ^\d+$"
+    )
+
+
+def test_missing_optional_variable_is_not_an_error():
+    env = dict(VALID_ENV)
+    env.pop("NEWS_API_KEY", None)
+    is_valid, errors = EnvironmentValidator().validate_environment(env)
+    assert is_valid and errors == []
@@ -0,0 +1,28 @@
+import generate_enhanced_static_site as generator
+
+
+def _page(data):
+    return "".join(generator.iter_html(data))
+
+
+def test_distributions_use_server_totals():
+    """The server's summary is shown as-is, without a sample note."""
+    page = _page({
+        "analyses": [{"metrics": {"sentiment": -1}, "outlook": {}}],
+        "analysis_summary": {"positive": 40, "neutral": 3, "negative": 2, "bullish": 30, "bearish": 5},
+    })
+    assert "<strong>Positive:</strong> 40 analyses" in page
+    assert "Sample:" not in page
+
+
+def test_distributions_without_summary_are_labelled_as_sample():
+    """Counts over the fetched analyses only are marked as a sample."""
+    page = _page({
+        "analyses": [
+            {"metrics": {"sentiment": 0.5}, "outlook": {"forecast": "bullish"}},
+            {"metrics": {"sentiment": -0.2}, "outlook": {"forecast": "bearish"}},
+        ],
+        "analysis_summary": None,
+    })
+    assert "Sample: counted over the 2 most recent analyses" in page
+    assert "<strong>Positive:</strong> 1 analyses" in page
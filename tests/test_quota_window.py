@@ -0,0 +1,51 @@
+import pytest
+
+import quota_window
+from quota_window import QuotaWindow
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Settable wall-clock minute for the windows under test."""
+    now = {"minute": 1_000_000}
+    monkeypatch.setattr(quota_window, "current_minute", lambda: now["minute"])
+    return now
+
+
+def test_restore_same_minute_keeps_usage(clock):
+    """A snapshot restored within the same minute counts in full."""
+    window = QuotaWindow(10, 60, buckets=[3, 4], last_minute=clock["minute"])
+    assert window.used() == 7
+    assert window.snapshot() == ([3, 4], clock["minute"])
+
+
+def test_restore_shifts_buckets_by_downtime(clock):
+    """Minutes spent down push old buckets towards the end of the window."""
+    window = QuotaWindow(10, 3, buckets=[5, 2], last_minute=clock["minute"] - 2)
+    # [5, 2] shifted by two minutes: the 5 has aged out of a 3-minute window
+    assert window.snapshot() == ([2, 0, 0], clock["minute"])
+    assert window.used() == 2
+
+
+def test_restore_after_window_elapsed_drops_usage(clock):
+    """A service down longer than the window comes back with a full quota."""
+    window = QuotaWindow(10, 60, buckets=[10] * 60, last_minute=clock["minute"] - 600)
+    assert window.used() == 0
+    assert window.acquire(10)
+
+
+def test_undated_buckets_are_ignored(clock):
+    """Buckets saved without last_minute cannot be aged, so they are not trusted."""
+    assert QuotaWindow(10, 60, buckets=[9]).used() == 0
+
+
+def test_tick_catches_up_with_missed_minutes(clock):
+    """tick() starts one bucket per wall-clock minute, however late it runs."""
+    window = QuotaWindow(10, 3)
+    window.record(4)
+    clock["minute"] += 1
+    window.tick()
+    window.record(1)
+    clock["minute"] += 5
+    window.tick()
+    assert window.snapshot() == ([0, 0, 0], clock["minute"])